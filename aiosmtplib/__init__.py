@@ -27,6 +27,7 @@ from .errors import (
     SMTPTimeoutError,
     SMTPConnectResponseError,
 )
+from .pool import SMTPConnectionPool
 from .response import SMTPResponse
 from .smtp import SMTP
 from .typing import SMTPStatus
@@ -40,6 +41,7 @@ __copyright__ = "Copyright 2022 Cole Maclean"
 __all__ = (
     "send",
     "SMTP",
+    "SMTPConnectionPool",
     "SMTPResponse",
     "SMTPStatus",
     "SMTPAuthenticationError",
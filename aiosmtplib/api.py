@@ -7,7 +7,12 @@ import ssl
 from typing import Dict, Optional, Sequence, Tuple, Union, cast
 
 from .response import SMTPResponse
-from .smtp import DEFAULT_TIMEOUT, SMTP
+from .smtp import (
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    DEFAULT_TIMEOUT,
+    SMTP,
+)
 from .typing import SocketPathType
 
 
@@ -36,6 +41,8 @@ async def send(
     cert_bundle: Optional[str] = None,
     socket_path: Optional[SocketPathType] = None,
     sock: Optional[socket.socket] = None,
+    dns_cache_ttl: Optional[float] = DEFAULT_DNS_CACHE_TTL,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
 ) -> Tuple[Dict[str, SMTPResponse], str]:
     """
     Send an email message. On await, connects to the SMTP server using the details
@@ -58,7 +65,8 @@ async def send(
     :keyword password:  Password for login after connect.
     :keyword local_hostname: The hostname of the client.  If specified, used as the
         FQDN of the local host in the HELO/EHLO command. Otherwise, the result of
-        :func:`socket.getfqdn`. **Note that getfqdn will block the event loop.**
+        :func:`socket.getfqdn` (looked up in a thread so as not to block the
+        event loop, and cached for the life of the process).
     :keyword source_address: Takes a 2-tuple (host, port) for the socket to bind to
         as its source address before connecting. If the host is '' and port is 0,
         the OS default behavior will be used.
@@ -84,6 +92,13 @@ async def send(
         hostname or port. Accepts str, bytes, or a pathlike object.
     :keyword sock: An existing, connected socket object. If given, none of
         hostname, port, or socket_path should be provided.
+    :keyword dns_cache_ttl: Time, in seconds, to cache the addresses ``hostname``
+        resolves to. Defaults to 60. If ``None`` or ``0``, a lookup is made on
+        every connect.
+    :keyword happy_eyeballs_delay: If ``hostname`` resolves to both IPv4 and
+        IPv6 addresses, time in seconds to wait for a connection attempt before
+        also trying the next address (see :rfc:`8305`). Defaults to 0.25. If
+        ``None``, addresses are tried one at a time.
 
     :raises ValueError: required arguments missing or mutually exclusive options
         provided
@@ -114,6 +129,8 @@ async def send(
         sock=sock,
         username=username,
         password=password,
+        dns_cache_ttl=dns_cache_ttl,
+        happy_eyeballs_delay=happy_eyeballs_delay,
     )
 
     async with client:
@@ -2,7 +2,6 @@
 Authentication related methods.
 """
 import base64
-import hmac
 from typing import Tuple, Union
 
 
@@ -29,6 +28,9 @@ def auth_crammd5_verify(
     password_bytes = _ensure_bytes(password)
     decoded_challenge = base64.b64decode(challenge)
 
+    # Imported here so that clients not using CRAM-MD5 don't load hashlib.
+    import hmac
+
     md5_digest = hmac.new(password_bytes, msg=decoded_challenge, digestmod="md5")
     verification = username_bytes + b" " + md5_digest.hexdigest().encode("ascii")
     encoded_verification = base64.b64encode(verification)
@@ -0,0 +1,303 @@
+"""
+Connection pooling, to reuse SMTP sessions across multiple sends.
+"""
+import asyncio
+import collections
+import contextlib
+import time
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from .errors import (
+    SMTPException,
+    SMTPResponseException,
+    SMTPServerDisconnected,
+    SMTPTimeoutError,
+)
+from .smtp import SMTP
+
+
+__all__ = ("SMTPConnectionPool",)
+
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE = 5
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+PoolKey = Tuple[Tuple[str, Any], ...]
+
+
+class SMTPConnectionPool:
+    """
+    Keeps connected :class:`.SMTP` clients open between uses, so that sending
+    multiple messages to the same server doesn't require a new connection,
+    TLS handshake and EHLO for each one.
+
+    Basic usage:
+
+        >>> event_loop = asyncio.get_event_loop()
+        >>> pool = aiosmtplib.SMTPConnectionPool()
+        >>> sender = "root@localhost"
+        >>> recipients = ["somebody@localhost"]
+        >>> async def send_message():
+        ...     async with pool.acquire(hostname="127.0.0.1", port=1025) as smtp:
+        ...         return await smtp.sendmail(sender, recipients, "Hello World")
+        >>> event_loop.run_until_complete(send_message())
+        ({}, 'OK')
+        >>> event_loop.run_until_complete(pool.close())
+
+    Keyword arguments to :meth:`acquire` are passed to :class:`.SMTP`, and
+    clients are only reused for identical arguments. An idle client is sent
+    RSET before it is reused; if that fails, a new connection is made instead.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+    ) -> None:
+        """
+        :keyword max_connections: Maximum number of open connections, both in
+            use and idle. Once reached, :meth:`acquire` waits for a connection
+            to be released. Defaults to 10.
+        :keyword max_keepalive: Maximum number of idle connections to keep
+            open. Defaults to 5.
+        :keyword keepalive_expiry: Time, in seconds, to keep an idle connection
+            open. Defaults to 30. If ``None``, idle connections do not expire.
+
+        :raises ValueError: invalid limits provided
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        if max_keepalive < 0:
+            raise ValueError("max_keepalive must not be negative")
+
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+
+        self._idle_clients: Dict[PoolKey, Deque[Tuple[float, SMTP]]] = {}
+        self._connection_count = 0
+        self._connection_released: Optional[asyncio.Condition] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "SMTPConnectionPool":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def connection_count(self) -> int:
+        """
+        The number of open connections, both in use and idle.
+        """
+        return self._connection_count
+
+    @property
+    def idle_count(self) -> int:
+        """
+        The number of idle connections.
+        """
+        return sum(len(clients) for clients in self._idle_clients.values())
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, **kwargs: Any) -> AsyncIterator[SMTP]:
+        """
+        Get a connected :class:`.SMTP` client, reusing an idle one if possible.
+        Keyword arguments are as for :class:`.SMTP`.
+
+        The client is returned to the pool on exit. If an exception is raised
+        inside the block, or the client was disconnected, it is closed instead.
+
+        :raises RuntimeError: the pool has been closed
+        :raises ValueError: a ``sock`` argument was provided
+        """
+        self._raise_if_closed()
+        if kwargs.get("sock") is not None:
+            raise ValueError("The sock option is not compatible with pooling")
+
+        key: PoolKey = tuple(sorted(kwargs.items()))
+        client = await self._get_client(key, kwargs)
+        try:
+            yield client
+        except BaseException:
+            await self._discard(client, send_quit=False)
+            raise
+
+        await self._put_client(key, client)
+
+    async def close(self) -> None:
+        """
+        Close all idle connections, and stop accepting new ones. Connections
+        that are in use are closed when released.
+        """
+        self._closed = True
+
+        idle_clients = [
+            client for clients in self._idle_clients.values() for _, client in clients
+        ]
+        self._idle_clients.clear()
+
+        # Wake anything waiting for a free connection, so it can raise
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+        for client in idle_clients:
+            await self._discard(client)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._connection_released is None:
+            self._connection_released = asyncio.Condition()
+
+        return self._connection_released
+
+    async def _get_client(self, key: PoolKey, smtp_kwargs: Dict[str, Any]) -> SMTP:
+        condition = self._get_condition()
+
+        while True:
+            async with condition:
+                self._raise_if_closed()
+                client = self._pop_idle_client(key)
+                while client is None and self._connection_count >= self.max_connections:
+                    if not self._close_oldest_idle_client():
+                        await condition.wait()
+                        self._raise_if_closed()
+                    client = self._pop_idle_client(key)
+
+                if client is None:
+                    self._connection_count += 1
+
+            if client is None:
+                return await self._connect(smtp_kwargs)
+
+            try:
+                await client.rset()
+            except BaseException as exc:
+                # The client is no longer idle, so its slot must be freed even
+                # if we were cancelled.
+                await self._discard(client, send_quit=False)
+                if not isinstance(exc, SMTPException):
+                    raise
+            else:
+                return client
+
+    async def _connect(self, smtp_kwargs: Dict[str, Any]) -> SMTP:
+        """
+        Connect a new client. A connection slot must already be reserved.
+        """
+        try:
+            client = SMTP(**smtp_kwargs)
+            await client.connect()
+        except BaseException:
+            await self._release_slot()
+            raise
+
+        return client
+
+    async def _put_client(self, key: PoolKey, client: SMTP) -> None:
+        try:
+            if not self._closed and client.is_connected:
+                condition = self._get_condition()
+                async with condition:
+                    if self.idle_count < self.max_keepalive:
+                        idle_clients = self._idle_clients.setdefault(
+                            key, collections.deque()
+                        )
+                        idle_clients.append((time.monotonic(), client))
+                        condition.notify()
+                        return
+        except BaseException:
+            await self._discard(client, send_quit=False)
+            raise
+
+        await self._discard(client)
+
+    async def _discard(self, client: SMTP, send_quit: bool = True) -> None:
+        """
+        Disconnect a client (politely, if ``send_quit`` is True) and free its
+        slot.
+        """
+        try:
+            if send_quit and client.is_connected:
+                try:
+                    await client.quit()
+                except (
+                    SMTPServerDisconnected,
+                    SMTPResponseException,
+                    SMTPTimeoutError,
+                ):
+                    pass
+        finally:
+            client.close()
+            await self._release_slot()
+
+    async def _release_slot(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._connection_count -= 1
+            condition.notify()
+
+    def _raise_if_closed(self) -> None:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+    def _pop_idle_client(self, key: PoolKey) -> Optional[SMTP]:
+        """
+        Get the most recently used idle client for the key given, closing any
+        that have expired or been disconnected. Must be called with the
+        condition lock held.
+        """
+        idle_clients = self._idle_clients.get(key)
+        if not idle_clients:
+            return None
+
+        if self.keepalive_expiry is not None:
+            expired_before = time.monotonic() - self.keepalive_expiry
+            while idle_clients and idle_clients[0][0] <= expired_before:
+                _, expired_client = idle_clients.popleft()
+                self._close_idle_client(expired_client)
+
+        client: Optional[SMTP] = None
+        while idle_clients and client is None:
+            _, client = idle_clients.pop()
+            if not client.is_connected:
+                self._close_idle_client(client)
+                client = None
+
+        if not idle_clients:
+            del self._idle_clients[key]
+
+        return client
+
+    def _close_oldest_idle_client(self) -> bool:
+        """
+        Close the least recently used idle client, if any, to free a slot.
+        Must be called with the condition lock held.
+        """
+        oldest_key: Optional[PoolKey] = None
+        for key, idle_clients in self._idle_clients.items():
+            if oldest_key is None or (
+                idle_clients[0][0] < self._idle_clients[oldest_key][0][0]
+            ):
+                oldest_key = key
+
+        if oldest_key is None:
+            return False
+
+        idle_clients = self._idle_clients[oldest_key]
+        _, client = idle_clients.popleft()
+        if not idle_clients:
+            del self._idle_clients[oldest_key]
+        self._close_idle_client(client)
+
+        return True
+
+    def _close_idle_client(self, client: SMTP) -> None:
+        """
+        Close an idle client without waiting on the server. Must be called with
+        the condition lock held.
+        """
+        client.close()
+        self._connection_count -= 1
+        self._get_condition().notify()
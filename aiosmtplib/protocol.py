@@ -108,6 +108,9 @@ class SMTPProtocol(FlowControlMixin, asyncio.BaseProtocol):
         self._closed: "asyncio.Future[None]" = self._loop.create_future()
 
     def __del__(self) -> None:
+        self._retrieve_waiter_exceptions()
+
+    def _retrieve_waiter_exceptions(self) -> None:
         # Avoid 'Future exception was never retrieved' warnings
         if (
             self._response_waiter
@@ -125,6 +128,38 @@ class SMTPProtocol(FlowControlMixin, asyncio.BaseProtocol):
     def _get_close_waiter(self, stream: asyncio.StreamWriter) -> "asyncio.Future[None]":
         return self._closed
 
+    def __call__(self) -> "SMTPProtocol":
+        """
+        Return this instance, so that it can be passed as its own protocol
+        factory to the event loop's connection methods.
+        """
+        return self
+
+    def reset(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Clear all connection state, so that the protocol can be used for a new
+        connection. The previous connection must have been lost.
+        """
+        if self.transport is not None:
+            raise RuntimeError("Cannot reset a connected protocol")
+
+        self._retrieve_waiter_exceptions()
+
+        if loop is not None and loop is not self._loop:
+            self._loop = loop
+            self._closed = self._loop.create_future()
+        elif self._closed.done():
+            self._closed = self._loop.create_future()
+
+        self._paused = False
+        self._drain_waiter = None
+        self._connection_lost = False
+        self._over_ssl = False
+        self._buffer.clear()
+        self._response_waiter = None
+        self._connection_lost_waiter = None
+        self._command_lock = None
+
     @property
     def is_connected(self) -> bool:
         """
@@ -5,10 +5,29 @@ Implements SMTP, ESMTP & Auth methods.
 """
 import asyncio
 import email.message
+import ipaddress
+import itertools
+import re
 import socket
 import ssl
+import sys
+import threading
+import time
 import warnings
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from .auth import auth_crammd5_verify, auth_login_encode, auth_plain_encode
 from .email import (
@@ -39,12 +58,204 @@ from .response import SMTPResponse
 from .typing import Default, SMTPStatus, SocketPathType, _default
 
 
-__all__ = ("SMTP", "SMTP_PORT", "SMTP_TLS_PORT", "SMTP_STARTTLS_PORT")
+__all__ = (
+    "SMTP",
+    "SMTP_PORT",
+    "SMTP_TLS_PORT",
+    "SMTP_STARTTLS_PORT",
+    "clear_dns_cache",
+    "clear_ssl_context_cache",
+)
 
 SMTP_PORT = 25
 SMTP_TLS_PORT = 465
 SMTP_STARTTLS_PORT = 587
 DEFAULT_TIMEOUT = 60
+DEFAULT_DNS_CACHE_TTL = 60.0
+DNS_CACHE_SIZE = 64
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+SSL_CONTEXT_CACHE_SIZE = 64
+NEWLINE_REGEX = re.compile(r"[\r\n]")
+# Linux socket option to defer picking an ephemeral port from bind to connect.
+IP_BIND_ADDRESS_NO_PORT = getattr(socket, "IP_BIND_ADDRESS_NO_PORT", 24)
+
+# Maps connect/starttls keyword arguments to the attributes they're saved as.
+_SETTING_ATTRIBUTES: Dict[str, str] = {
+    "hostname": "hostname",
+    "port": "port",
+    "username": "_login_username",
+    "password": "_login_password",
+    "local_hostname": "_local_hostname",
+    "source_address": "source_address",
+    "use_tls": "use_tls",
+    "start_tls": "_start_tls_on_connect",
+    "validate_certs": "validate_certs",
+    "client_cert": "client_cert",
+    "client_key": "client_key",
+    "tls_context": "tls_context",
+    "cert_bundle": "cert_bundle",
+    "socket_path": "socket_path",
+    "sock": "sock",
+    "dns_cache_ttl": "dns_cache_ttl",
+    "happy_eyeballs_delay": "happy_eyeballs_delay",
+}
+# Boolean settings that use ``None``, rather than ``_default``, for "not given".
+_TRISTATE_SETTINGS = frozenset(("use_tls", "validate_certs"))
+
+_T = TypeVar("_T")
+
+_addrinfo_cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+_ssl_context_cache: Dict[bytes, ssl.SSLContext] = {}
+_cached_fqdn: Optional[str] = None
+_cached_fqdn_lock = threading.Lock()
+_default_tls_context: Optional[ssl.SSLContext] = None
+_default_tls_context_lock = threading.Lock()
+
+
+def clear_dns_cache() -> None:
+    """
+    Discard all cached hostname lookups.
+
+    Server addresses resolved on connect are cached for ``dns_cache_ttl``
+    seconds, so that repeated connections to the same server don't each
+    require a DNS lookup.
+    """
+    _addrinfo_cache.clear()
+
+
+def clear_ssl_context_cache() -> None:
+    """
+    Discard all cached :py:class:`ssl.SSLContext` objects.
+
+    Contexts built from the ``validate_certs``, ``cert_bundle``, ``client_cert``
+    and ``client_key`` options are cached, keyed on the contents of the files
+    given, so that reconnecting doesn't parse the same certificates again.
+    """
+    global _default_tls_context
+
+    _ssl_context_cache.clear()
+    with _default_tls_context_lock:
+        _default_tls_context = None
+
+
+def _get_fqdn() -> str:
+    """
+    Return the result of :func:`socket.getfqdn`, caching it for the life of the
+    process. This call may block, so run it in an executor from async code.
+    """
+    global _cached_fqdn
+
+    with _cached_fqdn_lock:
+        if _cached_fqdn is None:
+            _cached_fqdn = socket.getfqdn()
+
+        return _cached_fqdn
+
+
+if sys.version_info >= (3, 11):
+
+    async def _wait_until(awaitable: Awaitable[_T], deadline: Optional[float]) -> _T:
+        """
+        Await the awaitable given, raising :exc:`asyncio.TimeoutError` if it
+        isn't done by the deadline (in event loop time).
+        """
+        async with asyncio.timeout_at(deadline):
+            return await awaitable
+
+else:
+
+    async def _wait_until(awaitable: Awaitable[_T], deadline: Optional[float]) -> _T:
+        """
+        Await the awaitable given, raising :exc:`asyncio.TimeoutError` if it
+        isn't done by the deadline (in event loop time).
+        """
+        timeout: Optional[float] = None
+        if deadline is not None:
+            timeout = deadline - asyncio.get_running_loop().time()
+
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+
+
+def _get_default_tls_context() -> ssl.SSLContext:
+    """
+    Return a shared context for the default TLS options (validating server
+    certs against the system CA store, with no client cert), creating it on
+    first use.
+    """
+    global _default_tls_context
+
+    if _default_tls_context is None:
+        with _default_tls_context_lock:
+            if _default_tls_context is None:
+                _default_tls_context = ssl.create_default_context(
+                    ssl.Purpose.SERVER_AUTH
+                )
+
+    return _default_tls_context
+
+
+def _warn_source_address_renamed(stacklevel: int) -> None:
+    """
+    Warn that a str ``source_address`` was given, at the stack level of the
+    caller's caller given.
+    """
+    warnings.warn(
+        "The source_address keyword has been renamed to local_hostname "
+        "to match smtplib more closely.",
+        DeprecationWarning,
+        stacklevel=stacklevel + 1,
+    )
+
+
+def _get_address_family(address: str) -> int:
+    """
+    Get the address family of an IP address string.
+    """
+    return socket.AF_INET6 if ":" in address else socket.AF_INET
+
+
+def _interleave_address_families(addresses: List[str]) -> List[str]:
+    """
+    Reorder addresses so that families alternate, keeping the first family
+    first.
+    """
+    by_family: Dict[int, List[str]] = {}
+    for address in addresses:
+        by_family.setdefault(_get_address_family(address), []).append(address)
+
+    interleaved: List[str] = []
+    for group in itertools.zip_longest(*by_family.values()):
+        interleaved.extend(address for address in group if address is not None)
+
+    return interleaved
+
+
+def _get_tls_context_cache_key(
+    validate_certs: bool,
+    cert_bundle: Optional[str],
+    client_cert: Optional[str],
+    client_key: Optional[str],
+) -> bytes:
+    """
+    Hash TLS options (including certificate file contents) to a cache key.
+
+    :raises OSError: a certificate file could not be read
+    """
+    # Only needed for TLS, so plaintext clients don't pay to import it.
+    import hashlib
+
+    key_hash = hashlib.blake2b(b"1" if validate_certs else b"0", digest_size=16)
+    for path in (cert_bundle, client_cert, client_key):
+        if path is None:
+            key_hash.update(b"\x00")
+            continue
+
+        with open(path, "rb") as pem_file:
+            contents = pem_file.read()
+        key_hash.update(b"\x01" + len(contents).to_bytes(8, "big"))
+        key_hash.update(contents)
+
+    return key_hash.digest()
 
 
 class SMTP:
@@ -97,6 +308,8 @@ class SMTP:
         cert_bundle: Optional[str] = None,
         socket_path: Optional[SocketPathType] = None,
         sock: Optional[socket.socket] = None,
+        dns_cache_ttl: Optional[float] = DEFAULT_DNS_CACHE_TTL,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
     ) -> None:
         """
         :keyword hostname:  Server name (or IP) to connect to. Defaults to "localhost".
@@ -106,7 +319,8 @@ class SMTP:
         :keyword password:  Password for login after connect.
         :keyword local_hostname: The hostname of the client.  If specified, used as the
             FQDN of the local host in the HELO/EHLO command. Otherwise, the result of
-            :func:`socket.getfqdn`. **Note that getfqdn will block the event loop.**
+            :func:`socket.getfqdn` (looked up in a thread so as not to block the
+            event loop, and cached for the life of the process).
         :keyword source_address: Takes a 2-tuple (host, port) for the socket to bind to
             as its source address before connecting. If the host is '' and port is 0,
             the OS default behavior will be used.
@@ -132,11 +346,23 @@ class SMTP:
             hostname or port. Accepts str, bytes, or a pathlike object.
         :keyword sock: An existing, connected socket object. If given, none of
             hostname, port, or socket_path should be provided.
+        :keyword dns_cache_ttl: Time, in seconds, to cache the addresses
+            ``hostname`` resolves to. Defaults to 60. If ``None`` or ``0``, a
+            lookup is made on every connect.
+        :keyword happy_eyeballs_delay: If ``hostname`` resolves to both IPv4
+            and IPv6 addresses, time in seconds to wait for a connection attempt
+            before also trying the next address (see :rfc:`8305`). Defaults to
+            0.25. If ``None``, addresses are tried one at a time.
 
         :raises ValueError: mutually exclusive options provided
         """
         self.protocol: Optional[SMTPProtocol] = None
+        # Kept after close, so that it can be reset and reused on reconnect.
+        self._spare_protocol: Optional[SMTPProtocol] = None
         self.transport: Optional[asyncio.BaseTransport] = None
+        # Extra info doesn't change for the life of a transport, so we cache it
+        # until the transport is replaced.
+        self._transport_info: Dict[str, Any] = {}
 
         # Kwarg defaults are provided here, and saved for connect.
         self.hostname = hostname
@@ -154,21 +380,19 @@ class SMTP:
         self.cert_bundle = cert_bundle
         self.socket_path = socket_path
         self.sock = sock
+        self.dns_cache_ttl = dns_cache_ttl
+        self.happy_eyeballs_delay = happy_eyeballs_delay
 
         self.source_address: Optional[Tuple[str, int]] = None
         if source_address and isinstance(source_address, str):
-            warnings.warn(
-                "The source_address keyword has been renamed to local_hostname "
-                "to match smtplib more closely.",
-                DeprecationWarning,
-                stacklevel=4,
-            )
+            _warn_source_address_renamed(stacklevel=4)
             self._local_hostname = source_address
         else:
             self.source_address = source_address
 
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self._connect_lock: Optional[asyncio.Lock] = None
+        self._connect_task: Optional["asyncio.Task[SMTPResponse]"] = None
         self.last_helo_response: Optional[SMTPResponse] = None
         self._last_ehlo_response: Optional[SMTPResponse] = None
         self.esmtp_extensions: Dict[str, str] = {}
@@ -180,7 +404,14 @@ class SMTP:
 
     async def __aenter__(self) -> "SMTP":
         if not self.is_connected:
-            await self.connect()
+            # Context manager sessions are exclusive; the lock is released on
+            # close.
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            await self._connect_lock.acquire()
+
+            if not self.is_connected:
+                await self.connect()
 
         return self
 
@@ -207,12 +438,35 @@ class SMTP:
     def local_hostname(self) -> str:
         """
         Get the system hostname to be sent to the SMTP server.
-        Simply caches the result of :func:`socket.getfqdn`.
+
+        If the FQDN of the local host hasn't been looked up yet and this is
+        accessed from inside a running event loop, the result of
+        :func:`socket.gethostname` is returned instead of blocking on
+        :func:`socket.getfqdn`.
         """
-        if self._local_hostname is None:
-            self._local_hostname = socket.getfqdn()
+        if self._local_hostname is not None:
+            return self._local_hostname
+        if _cached_fqdn is not None:
+            return _cached_fqdn
 
-        return self._local_hostname
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _get_fqdn()
+
+        return socket.gethostname()
+
+    async def _get_local_hostname(self) -> str:
+        """
+        Get the system hostname to be sent to the SMTP server, without
+        blocking the event loop.
+        """
+        if self._local_hostname is not None:
+            return self._local_hostname
+        if _cached_fqdn is not None:
+            return _cached_fqdn
+
+        return await asyncio.get_running_loop().run_in_executor(None, _get_fqdn)
 
     @property
     def last_ehlo_response(self) -> Union[SMTPResponse, None]:
@@ -244,68 +498,27 @@ class SMTP:
         """
         return [auth for auth in self.AUTH_METHODS if auth in self.server_auth_methods]
 
-    def _update_settings_from_kwargs(
-        self,
-        hostname: Optional[Union[str, Default]] = _default,
-        port: Optional[Union[int, Default]] = _default,
-        username: Optional[Union[str, bytes, Default]] = _default,
-        password: Optional[Union[str, bytes, Default]] = _default,
-        local_hostname: Optional[Union[str, Default]] = _default,
-        source_address: Optional[Union[Tuple[str, int], Default]] = _default,
-        use_tls: Optional[bool] = None,
-        start_tls: Optional[Union[bool, Default]] = _default,
-        validate_certs: Optional[bool] = None,
-        client_cert: Optional[Union[str, Default]] = _default,
-        client_key: Optional[Union[str, Default]] = _default,
-        tls_context: Optional[Union[ssl.SSLContext, Default]] = _default,
-        cert_bundle: Optional[Union[str, Default]] = _default,
-        socket_path: Optional[Union[SocketPathType, Default]] = _default,
-        sock: Optional[Union[socket.socket, Default]] = _default,
-    ) -> None:
+    def _update_settings_from_kwargs(self, **kwargs: Any) -> None:
         """Update our configuration from the kwargs provided.
 
-        This method can be called multiple times.
-        """
-        if hostname is not _default:
-            self.hostname = hostname
-        if use_tls is not None:
-            self.use_tls = use_tls
-        if start_tls is not _default:
-            self._start_tls_on_connect = start_tls
-        if validate_certs is not None:
-            self.validate_certs = validate_certs
-        if port is not _default:
-            self.port = port
-        if username is not _default:
-            self._login_username = username
-        if password is not _default:
-            self._login_password = password
-
-        if local_hostname is not _default:
-            self._local_hostname = local_hostname
-        if source_address is not _default:
-            if isinstance(source_address, str):
-                warnings.warn(
-                    "The source_address keyword has been renamed to local_hostname "
-                    "to match smtplib more closely.",
-                    DeprecationWarning,
-                    stacklevel=3,
-                )
-                self._local_hostname = source_address
-            else:
-                self.source_address = source_address
-        if client_cert is not _default:
-            self.client_cert = client_cert
-        if client_key is not _default:
-            self.client_key = client_key
-        if tls_context is not _default:
-            self.tls_context = tls_context
-        if cert_bundle is not _default:
-            self.cert_bundle = cert_bundle
-        if socket_path is not _default:
-            self.socket_path = socket_path
-        if sock is not _default:
-            self.sock = sock
+        Arguments that are ``_default`` (or ``None``, for ``use_tls`` and
+        ``validate_certs``) are ignored. This method can be called multiple times.
+        """
+        # Bind module level lookups locally, as this runs on every connect.
+        default = _default
+        tristate_settings = _TRISTATE_SETTINGS
+        setting_attributes = _SETTING_ATTRIBUTES
+
+        # Handle the deprecated str form up front, so the loop doesn't check for it.
+        if isinstance(kwargs.get("source_address"), str):
+            _warn_source_address_renamed(stacklevel=3)
+            kwargs["local_hostname"] = kwargs.pop("source_address")
+
+        for name, value in kwargs.items():
+            if value is default or (value is None and name in tristate_settings):
+                continue
+
+            setattr(self, setting_attributes[name], value)
 
     def _validate_config(self) -> None:
         if self._start_tls_on_connect and self.use_tls:
@@ -316,26 +529,30 @@ class SMTP:
                 "Either a TLS context or a certificate/key must be provided"
             )
 
-        if self.sock is not None and any([self.hostname, self.port, self.socket_path]):
+        if self.sock is not None and (
+            self.hostname is not None
+            or self.port is not None
+            or self.socket_path is not None
+        ):
             raise ValueError(
                 "The socket option is not compatible with hostname, port or socket_path"
             )
 
-        if self.socket_path is not None and any([self.hostname, self.port]):
+        if self.socket_path is not None and (
+            self.hostname is not None or self.port is not None
+        ):
             raise ValueError(
                 "The socket_path option is not compatible with hostname/port"
             )
 
-        if self._local_hostname is not None and (
-            "\r" in self._local_hostname or "\n" in self._local_hostname
+        if self._local_hostname is not None and NEWLINE_REGEX.search(
+            self._local_hostname
         ):
             raise ValueError(
                 "The local_hostname param contains prohibited newline characters"
             )
 
-        if self.hostname is not None and (
-            "\r" in self.hostname or "\n" in self.hostname
-        ):
+        if self.hostname is not None and NEWLINE_REGEX.search(self.hostname):
             raise ValueError(
                 "The hostname param contains prohibited newline characters"
             )
@@ -369,6 +586,8 @@ class SMTP:
         cert_bundle: Optional[Union[str, Default]] = _default,
         socket_path: Optional[Union[SocketPathType, Default]] = _default,
         sock: Optional[Union[socket.socket, Default]] = _default,
+        dns_cache_ttl: Optional[Union[float, Default]] = _default,
+        happy_eyeballs_delay: Optional[Union[float, Default]] = _default,
     ) -> SMTPResponse:
         """
         Initialize a connection to the server. Options provided to
@@ -382,7 +601,8 @@ class SMTP:
         :keyword password:  Password for login after connect.
         :keyword local_hostname: The hostname of the client.  If specified, used as the
             FQDN of the local host in the HELO/EHLO command. Otherwise, the result of
-            :func:`socket.getfqdn`. **Note that getfqdn will block the event loop.**
+            :func:`socket.getfqdn` (looked up in a thread so as not to block the
+            event loop, and cached for the life of the process).
         :keyword source_address: Takes a 2-tuple (host, port) for the socket to bind to
             as its source address before connecting. If the host is '' and port is 0,
             the OS default behavior will be used.
@@ -408,42 +628,61 @@ class SMTP:
             hostname or port. Accepts str, bytes, or a pathlike object.
         :keyword sock: An existing, connected socket object. If given, none of
             hostname, port, or socket_path should be provided.
-
+        :keyword dns_cache_ttl: Time, in seconds, to cache the addresses
+            ``hostname`` resolves to. Defaults to 60. If ``None`` or ``0``, a
+            lookup is made on every connect.
+        :keyword happy_eyeballs_delay: If ``hostname`` resolves to both IPv4
+            and IPv6 addresses, time in seconds to wait for a connection attempt
+            before also trying the next address (see :rfc:`8305`). Defaults to
+            0.25. If ``None``, addresses are tried one at a time.
+
+        If a connection attempt is already in progress, this waits for it and
+        returns its result instead of connecting again (in which case any
+        options provided are ignored). Cancelling a call stops it waiting, but
+        the attempt continues for any other callers.
+
+        :raises SMTPException: already connected
         :raises ValueError: mutually exclusive options provided
         """
-        self._update_settings_from_kwargs(
-            hostname=hostname,
-            port=port,
-            local_hostname=local_hostname,
-            source_address=source_address,
-            use_tls=use_tls,
-            start_tls=start_tls,
-            validate_certs=validate_certs,
-            client_cert=client_cert,
-            client_key=client_key,
-            tls_context=tls_context,
-            cert_bundle=cert_bundle,
-            socket_path=socket_path,
-            sock=sock,
-            username=username,
-            password=password,
-        )
-        self._validate_config()
+        if self._connect_task is not None and not self._connect_task.done():
+            return await asyncio.shield(self._connect_task)
+        if self.is_connected:
+            raise SMTPException("Already connected")
+
+        settings = locals()
+        default = _default
+        setting_attributes = _SETTING_ATTRIBUTES
+        try:
+            self._update_settings_from_kwargs(
+                **{
+                    name: value
+                    for name, value in settings.items()
+                    if value is not default and name in setting_attributes
+                }
+            )
+            self._validate_config()
+        except BaseException:
+            # As for a failed connection attempt, reset our state (and release
+            # the context manager lock, if held)
+            self.close()
+            raise
 
         self.loop = asyncio.get_running_loop()
-        if self._connect_lock is None:
-            self._connect_lock = asyncio.Lock()
-        await self._connect_lock.acquire()
+        self._connect_task = self.loop.create_task(
+            self._connect(timeout=self.timeout if timeout is _default else timeout)
+        )
 
+        # Shielded, so cancelling one caller doesn't cancel the attempt for others
+        return await asyncio.shield(self._connect_task)
+
+    async def _connect(self, timeout: Optional[float]) -> SMTPResponse:
         # Set default port last in case use_tls or start_tls is provided,
         # and only if we're not using a socket.
         if self.port is None and self.sock is None and self.socket_path is None:
             self.port = self._get_default_port()
 
         try:
-            response = await self._create_connection(
-                timeout=self.timeout if timeout is _default else timeout
-            )
+            response = await self._create_connection(timeout=timeout)
         except Exception as exc:
             self.close()  # Reset our state to disconnected
             raise exc
@@ -457,9 +696,17 @@ class SMTP:
         if self.loop is None:
             raise RuntimeError("No event loop set")
 
-        protocol = SMTPProtocol(
-            loop=self.loop, connection_lost_callback=self._connection_lost
-        )
+        # The timeout covers both connecting and the server ready message.
+        deadline: Optional[float] = None
+        if timeout is not None:
+            deadline = self.loop.time() + timeout
+
+        protocol = self._spare_protocol
+        self._spare_protocol = None
+        if protocol is not None and protocol.transport is None:
+            protocol.reset(loop=self.loop)
+        else:
+            protocol = SMTPProtocol(connection_lost_callback=self._connection_lost)
 
         tls_context: Optional[ssl.SSLContext] = None
         ssl_handshake_timeout: Optional[float] = None
@@ -467,16 +714,17 @@ class SMTP:
             tls_context = self._get_tls_context()
             ssl_handshake_timeout = timeout
 
+        connect_coro: Awaitable[Tuple[asyncio.BaseTransport, asyncio.BaseProtocol]]
         if self.sock:
             connect_coro = self.loop.create_connection(
-                lambda: protocol,
+                protocol,
                 sock=self.sock,
                 ssl=tls_context,
                 ssl_handshake_timeout=ssl_handshake_timeout,
             )
         elif self.socket_path:
             connect_coro = self.loop.create_unix_connection(
-                lambda: protocol,
+                protocol,
                 path=self.socket_path,  # type: ignore
                 ssl=tls_context,
                 ssl_handshake_timeout=ssl_handshake_timeout,
@@ -487,34 +735,34 @@ class SMTP:
             if self.port is None:
                 raise RuntimeError("No port provided; default should have been set")
 
-            connect_coro = self.loop.create_connection(
-                lambda: protocol,
-                host=self.hostname,
-                port=self.port,
-                ssl=tls_context,
-                ssl_handshake_timeout=ssl_handshake_timeout,
-                local_addr=self.source_address,
+            connect_coro = self._create_tcp_connection(
+                protocol, self.hostname, self.port, tls_context, ssl_handshake_timeout
             )
 
         try:
-            transport, _ = await asyncio.wait_for(connect_coro, timeout=timeout)
+            transport, _ = await _wait_until(connect_coro, deadline)
         except (TimeoutError, asyncio.TimeoutError) as exc:
             raise SMTPConnectTimeoutError(
-                f"Timed out connecting to {self.hostname} on port {self.port}"
+                f"Timed out connecting to {self._connect_target}"
             ) from exc
         except OSError as exc:
             raise SMTPConnectError(
-                f"Error connecting to {self.hostname} on port {self.port}: {exc}"
+                f"Error connecting to {self._connect_target}: {exc}"
             ) from exc
 
         self.protocol = protocol
         self.transport = transport
+        self._transport_info.clear()
+
+        read_timeout: Optional[float] = None
+        if deadline is not None:
+            read_timeout = max(0.0, deadline - self.loop.time())
 
         try:
-            response = await protocol.read_response(timeout=timeout)
+            response = await protocol.read_response(timeout=read_timeout)
         except SMTPServerDisconnected as exc:
             raise SMTPConnectError(
-                f"Error connecting to {self.hostname} on port {self.port}: {exc}"
+                f"Error connecting to {self._connect_target}: {exc}"
             ) from exc
         except SMTPTimeoutError as exc:
             raise SMTPConnectTimeoutError(
@@ -526,6 +774,249 @@ class SMTP:
 
         return response
 
+    @property
+    def _connect_target(self) -> str:
+        """
+        Describe the server we're connecting to, for error messages.
+        """
+        return f"{self.hostname} on port {self.port}"
+
+    async def _create_tcp_connection(
+        self,
+        protocol: SMTPProtocol,
+        hostname: str,
+        port: int,
+        tls_context: Optional[ssl.SSLContext],
+        ssl_handshake_timeout: Optional[float],
+    ) -> Tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+        """
+        Connect to each address the hostname given resolves to in turn, until
+        one succeeds.
+        """
+        if self.loop is None:
+            raise RuntimeError("No event loop set")
+
+        addresses = await self._resolve_hostname(hostname, port)
+        bind_without_port = self._can_bind_without_port()
+
+        # We can only make sockets ourselves if binding them won't block
+        if (
+            self.happy_eyeballs_delay is not None
+            and (self.source_address is None or bind_without_port)
+            and len({_get_address_family(address) for address in addresses}) > 1
+        ):
+            sock = await self._race_socket_connections(addresses, port)
+            return await self._create_connection_from_socket(
+                protocol, sock, hostname, tls_context, ssl_handshake_timeout
+            )
+
+        last_exc: Optional[OSError] = None
+        for address in addresses:
+            try:
+                if bind_without_port:
+                    sock = await self._connect_socket(address, port)
+                    return await self._create_connection_from_socket(
+                        protocol, sock, hostname, tls_context, ssl_handshake_timeout
+                    )
+
+                return await self.loop.create_connection(
+                    protocol,
+                    host=address,
+                    port=port,
+                    ssl=tls_context,
+                    server_hostname=hostname if tls_context else None,
+                    ssl_handshake_timeout=ssl_handshake_timeout,
+                    local_addr=self.source_address,
+                )
+            except ssl.SSLError:
+                raise
+            except OSError as exc:
+                last_exc = exc
+
+        if last_exc is None:
+            last_exc = OSError(f"No addresses found for {hostname}")
+        raise last_exc
+
+    async def _create_connection_from_socket(
+        self,
+        protocol: SMTPProtocol,
+        sock: socket.socket,
+        hostname: str,
+        tls_context: Optional[ssl.SSLContext],
+        ssl_handshake_timeout: Optional[float],
+    ) -> Tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+        """
+        Set up our transport on a socket we've already connected.
+        """
+        if self.loop is None:
+            raise RuntimeError("No event loop set")
+
+        try:
+            return await self.loop.create_connection(
+                protocol,
+                sock=sock,
+                ssl=tls_context,
+                server_hostname=hostname if tls_context else None,
+                ssl_handshake_timeout=ssl_handshake_timeout,
+            )
+        except BaseException:
+            sock.close()
+            raise
+
+    async def _race_socket_connections(
+        self, addresses: List[str], port: int
+    ) -> socket.socket:
+        """
+        Connect to the addresses given Happy Eyeballs style (RFC 8305),
+        alternating between address families. A new attempt is started each
+        time one fails, or after ``happy_eyeballs_delay`` seconds, and the first
+        to succeed is used.
+        """
+        if self.loop is None:
+            raise RuntimeError("No event loop set")
+
+        remaining = iter(_interleave_address_families(addresses))
+        pending: "Set[asyncio.Task[socket.socket]]" = set()
+        errors: List[OSError] = []
+        try:
+            while True:
+                address = next(remaining, None)
+                if address is not None:
+                    pending.add(
+                        self.loop.create_task(self._connect_socket(address, port))
+                    )
+                elif not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.happy_eyeballs_delay if address is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                winner: Optional[socket.socket] = None
+                unexpected_exc: Optional[BaseException] = None
+                for task in done:
+                    exc = task.exception()
+                    if exc is None and winner is None and unexpected_exc is None:
+                        winner = task.result()
+                    elif exc is None:
+                        task.result().close()
+                    elif isinstance(exc, OSError):
+                        errors.append(exc)
+                    elif unexpected_exc is None:
+                        unexpected_exc = exc
+
+                # Check every done task first, so that no sockets are left open
+                if unexpected_exc is not None:
+                    if winner is not None:
+                        winner.close()
+                    raise unexpected_exc
+                if winner is not None:
+                    return winner
+        finally:
+            for task in pending:
+                if (
+                    not task.cancel()
+                    and not task.cancelled()
+                    and task.exception() is None
+                ):
+                    task.result().close()
+
+        # Report every failed attempt, as loop.create_connection does
+        if not errors:
+            raise OSError("No addresses to connect to")
+        if all(str(exc) == str(errors[0]) for exc in errors):
+            raise errors[0]
+        raise OSError(
+            "Multiple exceptions: {}".format(", ".join(str(exc) for exc in errors))
+        )
+
+    def _can_bind_without_port(self) -> bool:
+        """
+        Check if we can bind to ``source_address`` ourselves, and leave the
+        choice of local port until connect time (Linux only). That avoids
+        reserving an ephemeral port for every bind, which contends on a kernel
+        lock when making many connections at once.
+        """
+        if not sys.platform.startswith("linux") or self.source_address is None:
+            return False
+
+        # IPv6 addresses may also include flowinfo and scope_id
+        source_host, source_port = self.source_address[:2]
+        if source_port != 0:
+            return False
+        if source_host == "":
+            return True
+
+        try:
+            ipaddress.ip_address(source_host)
+        except ValueError:
+            return False
+
+        return True
+
+    async def _connect_socket(self, address: str, port: int) -> socket.socket:
+        """
+        Connect a new socket to the address given. If we have a
+        ``source_address``, it must be one we can bind to without a port.
+        """
+        if self.loop is None:
+            raise RuntimeError("No event loop set")
+
+        sock = socket.socket(_get_address_family(address), socket.SOCK_STREAM)
+        try:
+            if self.source_address is not None:
+                sock.setsockopt(socket.IPPROTO_IP, IP_BIND_ADDRESS_NO_PORT, 1)
+                sock.bind(self.source_address)
+            sock.setblocking(False)
+            await self.loop.sock_connect(sock, (address, port))
+        except BaseException:
+            sock.close()
+            raise
+
+        return sock
+
+    async def _resolve_hostname(self, hostname: str, port: int) -> List[str]:
+        """
+        Get the addresses to connect to for the hostname given, from the DNS
+        cache if possible.
+        """
+        if self.loop is None:
+            raise RuntimeError("No event loop set")
+
+        try:
+            ipaddress.ip_address(hostname)
+        except ValueError:
+            pass
+        else:
+            return [hostname]
+
+        cache_key = (hostname, port)
+        if self.dns_cache_ttl:
+            cached = _addrinfo_cache.get(cache_key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    return cached[1]
+                _addrinfo_cache.pop(cache_key, None)
+
+        addrinfo = await self.loop.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+        addresses: List[str] = []
+        for _, _, _, _, sockaddr in addrinfo:
+            address = str(sockaddr[0])
+            if address not in addresses:
+                addresses.append(address)
+
+        if self.dns_cache_ttl:
+            expires = time.monotonic() + self.dns_cache_ttl
+            if (
+                cache_key not in _addrinfo_cache
+                and len(_addrinfo_cache) >= DNS_CACHE_SIZE
+            ):
+                _addrinfo_cache.pop(next(iter(_addrinfo_cache)), None)
+            _addrinfo_cache[cache_key] = (expires, addresses)
+
+        return addresses
+
     def _connection_lost(self, waiter: "asyncio.Future[None]") -> None:
         if waiter.cancelled() or waiter.exception() is not None:
             self.close()
@@ -579,24 +1070,56 @@ class SMTP:
 
     def _get_tls_context(self) -> ssl.SSLContext:
         """
-        Build an SSLContext object from the options we've been given.
+        Get an SSLContext object from the options we've been given, reusing a
+        cached context if one was already built from the same options.
         """
         if self.tls_context is not None:
-            context = self.tls_context
+            return self.tls_context
+        if (
+            self.validate_certs
+            and self.cert_bundle is None
+            and self.client_cert is None
+            and self.client_key is None
+        ):
+            return _get_default_tls_context()
+
+        try:
+            cache_key = _get_tls_context_cache_key(
+                bool(self.validate_certs),
+                self.cert_bundle,
+                self.client_cert,
+                self.client_key,
+            )
+        except OSError:
+            # Let the ssl module raise an appropriate error
+            return self._build_tls_context()
+
+        context = _ssl_context_cache.get(cache_key)
+        if context is None:
+            context = self._build_tls_context()
+            if len(_ssl_context_cache) >= SSL_CONTEXT_CACHE_SIZE:
+                _ssl_context_cache.pop(next(iter(_ssl_context_cache)), None)
+            _ssl_context_cache[cache_key] = context
+
+        return context
+
+    def _build_tls_context(self) -> ssl.SSLContext:
+        """
+        Build a new SSLContext object from the options we've been given.
+        """
+        # SERVER_AUTH is what we want for a client side socket
+        context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        context.check_hostname = bool(self.validate_certs)
+        if self.validate_certs:
+            context.verify_mode = ssl.CERT_REQUIRED
         else:
-            # SERVER_AUTH is what we want for a client side socket
-            context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
-            context.check_hostname = bool(self.validate_certs)
-            if self.validate_certs:
-                context.verify_mode = ssl.CERT_REQUIRED
-            else:
-                context.verify_mode = ssl.CERT_NONE
+            context.verify_mode = ssl.CERT_NONE
 
-            if self.cert_bundle is not None:
-                context.load_verify_locations(cafile=self.cert_bundle)
+        if self.cert_bundle is not None:
+            context.load_verify_locations(cafile=self.cert_bundle)
 
-            if self.client_cert is not None:
-                context.load_cert_chain(self.client_cert, keyfile=self.client_key)
+        if self.client_cert is not None:
+            context.load_cert_chain(self.client_cert, keyfile=self.client_key)
 
         return context
 
@@ -604,18 +1127,25 @@ class SMTP:
         """
         Closes the connection.
         """
-        if self.transport is not None and not self.transport.is_closing():
-            self.transport.close()
-
-        if self._connect_lock is not None and self._connect_lock.locked():
-            self._connect_lock.release()
+        # Transport close is idempotent, so no need to check is_closing first.
+        transport = self.transport
+        self.transport = None
+        self._transport_info.clear()
+        if transport is not None:
+            transport.close()
 
+        if self.protocol is not None:
+            self._spare_protocol = self.protocol
         self.protocol = None
-        self.transport = None
 
         # Reset ESMTP state
         self._reset_server_state()
 
+        # Release last, so that anything waiting on the lock sees us
+        # disconnected.
+        if self._connect_lock is not None and self._connect_lock.locked():
+            self._connect_lock.release()
+
     def get_transport_info(self, key: str) -> Any:
         """
         Get extra info from the transport.
@@ -635,7 +1165,11 @@ class SMTP:
         if self.transport is None:
             raise SMTPServerDisconnected("Server not connected")
 
-        return self.transport.get_extra_info(key)
+        try:
+            return self._transport_info[key]
+        except KeyError:
+            value = self._transport_info[key] = self.transport.get_extra_info(key)
+            return value
 
     # Base SMTP commands #
 
@@ -651,8 +1185,11 @@ class SMTP:
 
         :raises SMTPHeloError: on unexpected server response code
         """
+        if not hostname:
+            hostname = await self._get_local_hostname()
+
         response = self.last_helo_response = await self.execute_command(
-            b"HELO", (hostname or self.local_hostname).encode("ascii"), timeout=timeout
+            b"HELO", hostname.encode("ascii"), timeout=timeout
         )
 
         if response.code != SMTPStatus.completed:
@@ -909,7 +1446,7 @@ class SMTP:
         :raises SMTPHeloError: on unexpected server response code
         """
         if hostname is None:
-            hostname = self.local_hostname
+            hostname = await self._get_local_hostname()
 
         response = await self.execute_command(
             b"EHLO", hostname.encode("ascii"), timeout=timeout
@@ -1016,6 +1553,7 @@ class SMTP:
             raise SMTPServerDisconnected("Connection lost")
         # Update our transport reference
         self.transport = self.protocol.transport
+        self._transport_info.clear()
 
         # RFC 3207 part 4.2:
         # The client MUST discard any knowledge obtained from the server, such
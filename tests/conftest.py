@@ -6,12 +6,24 @@ import email.header
 import email.message
 import email.mime.multipart
 import email.mime.text
+import functools
+import os
 import pathlib
 import socket
 import ssl
 import sys
 from pathlib import Path
-from typing import Any, Callable, Coroutine, List, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import hypothesis
 import pytest
@@ -19,9 +31,11 @@ import trustme
 from aiosmtpd.controller import Controller as SMTPDController
 from aiosmtpd.smtp import SMTP as SMTPD
 
-from aiosmtplib import SMTP, SMTPStatus
+from aiosmtplib import SMTP, SMTPException, SMTPStatus
+from aiosmtplib.smtp import clear_dns_cache
 
 from .auth import DummySMTPAuth
+from .resolver import MockResolver
 from .smtpd import RecordingHandler, TestSMTPD
 
 
@@ -33,6 +47,8 @@ else:
     HAS_UVLOOP = True
 BASE_CERT_PATH = Path("tests/certs/")
 IS_PYPY = hasattr(sys, "pypy_version_info")
+# Set by pytest-xdist (e.g. "gw0") when running with ``-n``.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "master")
 
 # pypy can take a while to generate data, so don't fail the test due to health checks.
 if IS_PYPY:
@@ -65,9 +81,9 @@ def pytest_addoption(parser: Any) -> None:
     parser.addoption(
         "--event-loop",
         action="store",
-        default="asyncio",
+        default="uvloop" if HAS_UVLOOP else "asyncio",
         choices=["asyncio", "uvloop"],
-        help="event loop to run tests on",
+        help="event loop to run tests on (uvloop if installed, otherwise asyncio)",
     )
     parser.addoption(
         "--bind-addr",
@@ -98,6 +114,28 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
         asyncio.set_event_loop_policy(original_event_loop_policy)
 
 
+# Session scoped event loop #
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """
+    Share one event loop for the whole session, so that servers can be too.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+
+    # Clean up like asyncio.run does, so server connection handlers still
+    # running don't outlive the loop
+    pending = asyncio.all_tasks(loop)
+    if pending:
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
 # Session scoped static values #
 
 
@@ -109,7 +147,22 @@ def bind_address(request: pytest.FixtureRequest) -> str:
 
 @pytest.fixture(scope="session")
 def hostname(bind_address: str) -> str:
-    return bind_address
+    """Client side address, resolved once so connects skip the DNS lookup"""
+    addresses = socket.getaddrinfo(
+        bind_address, None, family=socket.AF_INET, type=socket.SOCK_STREAM
+    )
+    return str(addresses[0][4][0])
+
+
+@pytest.fixture(scope="function")
+def closed_tcp_port(bind_address: str) -> int:
+    """A port that was just listening, so connections to it are refused"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((bind_address, 0))
+        sock.listen()
+        port: int = sock.getsockname()[1]
+
+    return port
 
 
 @pytest.fixture(scope="session")
@@ -142,6 +195,10 @@ def message_str(recipient_str: str, sender_str: str) -> str:
 
 @pytest.fixture(scope="session")
 def smtpd_class() -> Type[SMTPD]:
+    """
+    Shared by all session scoped servers; patch it with monkeypatch only, so
+    changes are undone after each test.
+    """
     return TestSMTPD
 
 
@@ -328,22 +385,22 @@ def message(
 # Server helpers and factories #
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def received_messages() -> List[email.message.EmailMessage]:
     return []
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def received_commands() -> List[Tuple[str, Tuple[Any, ...]]]:
     return []
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_responses() -> List[str]:
     return []
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_handler(
     received_messages: List[email.message.EmailMessage],
     received_commands: List[Tuple[str, Tuple[Any, ...]]],
@@ -352,6 +409,20 @@ def smtpd_handler(
     return RecordingHandler(received_messages, received_commands, smtpd_responses)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_received_data(
+    received_messages: List[email.message.EmailMessage],
+    received_commands: List[Tuple[str, Tuple[Any, ...]]],
+    smtpd_responses: List[str],
+) -> None:
+    """
+    Start each test with empty lists of data received by the session servers.
+    """
+    received_messages.clear()
+    received_commands.clear()
+    smtpd_responses.clear()
+
+
 @pytest.fixture(scope="session")
 def smtpd_auth_callback(
     auth_username: str, auth_password: str
@@ -409,7 +480,7 @@ def smtpd_mock_response_done_then_close() -> (
             smtpd.session.host_name = args[0]
         await smtpd.push("250 done")
         await smtpd.push("221 bye now")
-        await smtpd.transport.close()
+        smtpd.transport.abort()
 
     return mock_response_done_then_close
 
@@ -430,7 +501,7 @@ def smtpd_mock_response_error_disconnect() -> (
         smtpd: SMTPD, *args: Any, **kwargs: Any
     ) -> None:
         await smtpd.push("501 error")
-        await smtpd.transport.close()
+        smtpd.transport.close()
 
     return mock_response_error_disconnect
 
@@ -509,7 +580,7 @@ def smtpd_mock_response_unavailable() -> Callable[[SMTPD], Coroutine[Any, Any, N
         smtpd: SMTPD, *args: Any, **kwargs: Any
     ) -> None:
         await smtpd.push("421 retry in 5 minutes")
-        await smtpd.transport.close()
+        smtpd.transport.close()
 
     return mock_response_unavailable
 
@@ -532,7 +603,7 @@ def smtpd_mock_response_tls_ready_disconnect() -> (
         smtpd: SMTPD, *args: Any, **kwargs: Any
     ) -> None:
         await smtpd.push("220 go for it")
-        await smtpd.transport.close()
+        smtpd.transport.close()
 
     return mock_response_tls_ready_disconnect
 
@@ -540,7 +611,7 @@ def smtpd_mock_response_tls_ready_disconnect() -> (
 @pytest.fixture(scope="session")
 def smtpd_mock_response_disconnect() -> Callable[[SMTPD], Coroutine[Any, Any, None]]:
     async def mock_response_disconnect(smtpd: SMTPD, *args: Any, **kwargs: Any) -> None:
-        await smtpd.transport.close()
+        smtpd.transport.close()
 
     return mock_response_disconnect
 
@@ -557,6 +628,8 @@ def smtpd_mock_response_eof() -> Callable[[SMTPD], Coroutine[Any, Any, None]]:
 def smtpd_mock_response_error_with_code_factory() -> (
     Callable[[str], Callable[[SMTPD], Coroutine[Any, Any, None]]]
 ):
+    # Tests parametrized by error code share one handler per code
+    @functools.lru_cache(maxsize=None)
     def factory(error_code: str) -> Callable[[SMTPD], Coroutine[Any, Any, None]]:
         async def mock_error_response(smtpd: SMTPD, *args: Any, **kwargs: Any) -> None:
             await smtpd.push(f"{error_code} error")
@@ -576,27 +649,33 @@ def smtpd_mock_response_error_with_code(
     return smtpd_mock_response_error_with_code_factory(str(error_code))
 
 
-@pytest.fixture(
-    scope="function",
-    params=(str, bytes, Path),
-    ids=("str", "bytes", "pathlike"),
-)
-def socket_path(
-    request: ParamFixtureRequest, tmp_path: Path
-) -> Union[str, bytes, Path]:
+@pytest.fixture(scope="session")
+def smtpd_socket_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
     if sys.platform.startswith("darwin"):
         # Work around OSError: AF_UNIX path too long
         tmp_dir = Path("/tmp")  # nosec
     else:
-        tmp_dir = tmp_path
+        tmp_dir = tmp_path_factory.mktemp("sockets")
 
+    # /tmp is shared between xdist workers, so keep their paths disjoint
     index = 0
-    socket_path = tmp_dir / f"aiosmtplib-test{index}"
+    socket_path = tmp_dir / f"aiosmtplib-test-{XDIST_WORKER}-{index}"
     while socket_path.exists():
         index += 1
-        socket_path = tmp_dir / f"aiosmtplib-test{index}"
+        socket_path = tmp_dir / f"aiosmtplib-test-{XDIST_WORKER}-{index}"
 
-    typed_socket_path: Union[str, bytes, Path] = request.param(socket_path)
+    return socket_path
+
+
+@pytest.fixture(
+    scope="function",
+    params=(str, bytes, Path),
+    ids=("str", "bytes", "pathlike"),
+)
+def socket_path(
+    request: ParamFixtureRequest, smtpd_socket_path: Path
+) -> Union[str, bytes, Path]:
+    typed_socket_path: Union[str, bytes, Path] = request.param(smtpd_socket_path)
 
     return typed_socket_path
 
@@ -604,17 +683,18 @@ def socket_path(
 # Servers #
 
 
-@pytest.fixture(scope="function")
-def smtpd_server(
-    request: pytest.FixtureRequest,
-    event_loop: asyncio.AbstractEventLoop,
-    bind_address: str,
+@pytest.fixture(scope="session")
+def smtpd_factory(
     hostname: str,
     smtpd_class: Type[SMTPD],
     smtpd_handler: RecordingHandler,
     server_tls_context: ssl.SSLContext,
     smtpd_auth_callback: Callable[[str, bytes, bytes], bool],
-) -> asyncio.AbstractServer:
+) -> Callable[[], SMTPD]:
+    """
+    Protocol factory shared by the plain TCP and unix socket servers.
+    """
+
     def factory() -> SMTPD:
         return smtpd_class(
             smtpd_handler,
@@ -624,9 +704,19 @@ def smtpd_server(
             auth_callback=smtpd_auth_callback,
         )
 
+    return factory
+
+
+@pytest.fixture(scope="session")
+def smtpd_server(
+    request: pytest.FixtureRequest,
+    event_loop: asyncio.AbstractEventLoop,
+    bind_address: str,
+    smtpd_factory: Callable[[], SMTPD],
+) -> asyncio.AbstractServer:
     server = event_loop.run_until_complete(
         event_loop.create_server(
-            factory, host=bind_address, port=0, family=socket.AF_INET
+            smtpd_factory, host=bind_address, port=0, family=socket.AF_INET
         )
     )
 
@@ -639,7 +729,7 @@ def smtpd_server(
     return server
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_smtputf8(
     request: pytest.FixtureRequest,
     event_loop: asyncio.AbstractEventLoop,
@@ -674,7 +764,7 @@ def smtpd_server_smtputf8(
     return server
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def echo_server(
     request: pytest.FixtureRequest,
     bind_address: str,
@@ -695,29 +785,15 @@ def echo_server(
     return server
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_socket_path(
     request: pytest.FixtureRequest,
     event_loop: asyncio.AbstractEventLoop,
-    hostname: str,
-    socket_path: Union[str, bytes, Path],
-    smtpd_class: Type[SMTPD],
-    smtpd_handler: RecordingHandler,
-    server_tls_context: ssl.SSLContext,
-    smtpd_auth_callback: Callable[[str, bytes, bytes], bool],
+    smtpd_socket_path: Path,
+    smtpd_factory: Callable[[], SMTPD],
 ) -> asyncio.AbstractServer:
-    def factory() -> SMTPD:
-        return smtpd_class(
-            smtpd_handler,
-            hostname=hostname,
-            enable_SMTPUTF8=False,
-            tls_context=server_tls_context,
-            auth_callback=smtpd_auth_callback,
-        )
-
     create_server_coro = event_loop.create_unix_server(
-        factory,
-        path=socket_path,  # type: ignore
+        smtpd_factory, path=str(smtpd_socket_path)
     )
     server = event_loop.run_until_complete(create_server_coro)
 
@@ -730,7 +806,7 @@ def smtpd_server_socket_path(
     return server
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_tls(
     request: pytest.FixtureRequest,
     event_loop: asyncio.AbstractEventLoop,
@@ -802,24 +878,24 @@ def _get_server_socket_port(server: asyncio.AbstractServer) -> Optional[int]:
     return None
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_port(smtpd_server: asyncio.AbstractServer) -> Optional[int]:
     return _get_server_socket_port(smtpd_server)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_smtputf8_port(
     smtpd_server_smtputf8: asyncio.AbstractServer,
 ) -> Optional[int]:
     return _get_server_socket_port(smtpd_server_smtputf8)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def echo_server_port(echo_server: asyncio.AbstractServer) -> Optional[int]:
     return _get_server_socket_port(echo_server)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def smtpd_server_tls_port(smtpd_server_tls: asyncio.AbstractServer) -> Optional[int]:
     return _get_server_socket_port(smtpd_server_tls)
 
@@ -830,6 +906,28 @@ def smtpd_server_threaded_port(smtpd_controller: SMTPDController) -> int:
     return port
 
 
+# DNS #
+
+
+@pytest.fixture(scope="function")
+def mock_resolver(
+    event_loop: asyncio.AbstractEventLoop,
+    hostname: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[MockResolver]:
+    """
+    Resolves all hostnames to ``hostname`` unless ``addresses`` is changed,
+    starting and finishing with an empty DNS cache.
+    """
+    resolver = MockResolver([hostname])
+    monkeypatch.setattr(event_loop, "getaddrinfo", resolver.getaddrinfo)
+    clear_dns_cache()
+
+    yield resolver
+
+    clear_dns_cache()
+
+
 # SMTP Clients #
 
 
@@ -846,6 +944,58 @@ def smtp_client(
     )
 
 
+@pytest.fixture(scope="session")
+def warm_smtp_client_session(
+    request: pytest.FixtureRequest,
+    event_loop: asyncio.AbstractEventLoop,
+    hostname: str,
+    smtpd_server_port: int,
+    client_tls_context: ssl.SSLContext,
+) -> SMTP:
+    client = SMTP(
+        hostname=hostname,
+        port=smtpd_server_port,
+        tls_context=client_tls_context,
+        start_tls=False,
+        timeout=1.0,
+    )
+
+    def close_client() -> None:
+        if client.is_connected:
+            event_loop.run_until_complete(client.quit())
+
+    request.addfinalizer(close_client)
+
+    return client
+
+
+@pytest.fixture(scope="function")
+def warm_smtp_client(
+    event_loop: asyncio.AbstractEventLoop, warm_smtp_client_session: SMTP
+) -> Iterator[SMTP]:
+    """
+    A client that stays connected between tests, for tests that only care about
+    behaviour after connect. Anything asserting on connect or disconnect, or
+    changing client config, should use smtp_client instead.
+    """
+    client = warm_smtp_client_session
+    if client.is_connected:
+        # RSET only resets the server side; forget any HELO/EHLO state too, so
+        # each test starts as if freshly connected
+        client._reset_server_state()
+    else:
+        event_loop.run_until_complete(client.connect())
+
+    yield client
+
+    # Reset the session for the next test, or drop the connection if that fails
+    if client.is_connected:
+        try:
+            event_loop.run_until_complete(client.rset())
+        except SMTPException:
+            client.close()
+
+
 @pytest.fixture(scope="function")
 def smtp_client_smtputf8(
     hostname: str, smtpd_server_smtputf8_port: int, client_tls_context: ssl.SSLContext
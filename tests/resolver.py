@@ -0,0 +1,22 @@
+import socket
+from typing import Any, List
+
+
+class MockResolver:
+    """
+    Stands in for ``loop.getaddrinfo``, resolving every hostname to
+    ``addresses`` and recording each lookup made.
+    """
+
+    def __init__(self, addresses: List[str]) -> None:
+        self.addresses = addresses
+        self.lookups: List[str] = []
+
+    async def getaddrinfo(self, host: str, port: int, **kwargs: Any) -> List[Any]:
+        self.lookups.append(host)
+        return [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", (address, port, 0, 0))
+            if ":" in address
+            else (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+            for address in self.addresses
+        ]
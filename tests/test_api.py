@@ -159,13 +159,15 @@ async def test_send_with_login(
 
 
 async def test_send_via_socket(
+    event_loop: asyncio.AbstractEventLoop,
     hostname: str,
     smtpd_server_port: int,
     message: email.message.Message,
     received_messages: List[email.message.EmailMessage],
 ) -> None:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-        sock.connect((hostname, smtpd_server_port))
+        sock.setblocking(False)
+        await event_loop.sock_connect(sock, (hostname, smtpd_server_port))
 
         errors, response = await send(
             message,
@@ -9,7 +9,7 @@ from typing import Any, Awaitable, Callable, Dict, List, Tuple, Type
 import pytest
 from aiosmtpd.smtp import SMTP as SMTPD
 
-from aiosmtplib import SMTP
+from aiosmtplib import SMTP, SMTPException, SMTPStatus
 from aiosmtplib.response import SMTPResponse
 
 
@@ -172,24 +172,64 @@ async def test_many_commands_with_gather(
     assert "Supported commands" in results[-1]
 
 
-async def test_close_works_on_stopped_loop(
-    event_loop: asyncio.AbstractEventLoop,
-    hostname: str,
-    smtpd_server_port: int,
-    client_tls_context: ssl.SSLContext,
+async def test_concurrent_connects_share_one_connection(
+    smtp_client: SMTP,
+    smtpd_server: asyncio.AbstractServer,
+    received_commands: List[Tuple[str, Tuple[Any, ...]]],
 ) -> None:
-    client = SMTP(
-        hostname=hostname, port=smtpd_server_port, tls_context=client_tls_context
+    responses = await asyncio.gather(
+        smtp_client.connect(), smtp_client.connect(), smtp_client.connect()
     )
 
-    await client.connect()
-    assert client.is_connected
-    assert client.transport is not None
+    assert responses[0] is responses[1] is responses[2]
+    assert smtp_client.is_connected
+
+    await smtp_client.quit()
+
+    assert [command[0] for command in received_commands].count("EHLO") == 1
+
+
+async def test_cancelling_first_connect_caller_doesnt_cancel_others(
+    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
+) -> None:
+    first = asyncio.create_task(smtp_client.connect())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(smtp_client.connect())
+    await asyncio.sleep(0)
+
+    first.cancel()
+    response = await second
 
-    event_loop.stop()
+    assert first.cancelled()
+    assert response.code == SMTPStatus.ready
+    assert smtp_client.is_connected
+
+    await smtp_client.quit()
+
+
+async def test_context_manager_after_invalid_config(
+    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer, hostname: str
+) -> None:
+    smtp_client.hostname = "localhost\r\nRCPT TO: <hacker@hackers.org>"
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            async with smtp_client:
+                pass
+
+    smtp_client.hostname = hostname
+    async with smtp_client:
+        assert smtp_client.is_connected
+
+
+async def test_connect_when_connected_raises(
+    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
+) -> None:
+    async with smtp_client:
+        with pytest.raises(SMTPException):
+            await smtp_client.connect()
 
-    client.close()
-    assert not client.is_connected
+        assert smtp_client.is_connected
 
 
 async def test_context_manager_entry_multiple_times_with_gather(
@@ -2,6 +2,8 @@
 Lower level SMTP command tests.
 """
 import asyncio
+import socket
+import threading
 from typing import Any, Callable, Coroutine, List, Tuple, Type
 
 import pytest
@@ -22,20 +24,16 @@ from .smtpd import RecordingHandler
 pytestmark = pytest.mark.asyncio()
 
 
-async def test_helo_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        response = await smtp_client.helo()
+async def test_helo_ok(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.helo()
 
-        assert response.code == SMTPStatus.completed
+    assert response.code == SMTPStatus.completed
 
 
-async def test_helo_with_hostname(
-    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
-) -> None:
-    async with smtp_client:
-        response = await smtp_client.helo(hostname="example.com")
+async def test_helo_with_hostname(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.helo(hostname="example.com")
 
-        assert response.code == SMTPStatus.completed
+    assert response.code == SMTPStatus.completed
 
 
 async def test_helo_error(
@@ -54,20 +52,44 @@ async def test_helo_error(
         assert exception_info.value.code == error_code
 
 
-async def test_ehlo_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        response = await smtp_client.ehlo()
+async def test_ehlo_ok(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.ehlo()
 
-        assert response.code == SMTPStatus.completed
+    assert response.code == SMTPStatus.completed
 
 
-async def test_ehlo_with_hostname(
-    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
+async def test_ehlo_with_hostname(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.ehlo(hostname="example.com")
+
+    assert response.code == SMTPStatus.completed
+
+
+async def test_ehlo_local_hostname_lookup_cached(
+    smtp_client: SMTP,
+    smtpd_server: asyncio.AbstractServer,
+    received_commands: List[Tuple[str, Tuple[Any, ...]]],
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
+    lookup_threads = []
+
+    def mock_getfqdn() -> str:
+        lookup_threads.append(threading.current_thread())
+        return "client.example.com"
+
+    monkeypatch.setattr(socket, "getfqdn", mock_getfqdn)
+    monkeypatch.setattr("aiosmtplib.smtp._cached_fqdn", None)
+
     async with smtp_client:
-        response = await smtp_client.ehlo(hostname="example.com")
+        await smtp_client.ehlo()
+        await smtp_client.ehlo()
 
-        assert response.code == SMTPStatus.completed
+    assert len(lookup_threads) == 1
+    assert lookup_threads[0] is not threading.main_thread()
+    assert smtp_client.local_hostname == "client.example.com"
+    ehlo_hostnames = [
+        args[0] for command, args in received_commands if command == "EHLO"
+    ]
+    assert ehlo_hostnames == ["client.example.com", "client.example.com"]
 
 
 async def test_ehlo_error(
@@ -205,12 +227,11 @@ async def test_ehlo_or_helo_if_needed_disconnect_after_ehlo(
             await smtp_client._ehlo_or_helo_if_needed()
 
 
-async def test_rset_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        response = await smtp_client.rset()
+async def test_rset_ok(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.rset()
 
-        assert response.code == SMTPStatus.completed
-        assert response.message == "OK"
+    assert response.code == SMTPStatus.completed
+    assert response.message == "OK"
 
 
 async def test_rset_error(
@@ -229,12 +250,11 @@ async def test_rset_error(
         assert exception_info.value.code == error_code
 
 
-async def test_noop_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        response = await smtp_client.noop()
+async def test_noop_ok(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.noop()
 
-        assert response.code == SMTPStatus.completed
-        assert response.message == "OK"
+    assert response.code == SMTPStatus.completed
+    assert response.message == "OK"
 
 
 async def test_noop_error(
@@ -253,21 +273,17 @@ async def test_noop_error(
         assert exception_info.value.code == error_code
 
 
-async def test_vrfy_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
+async def test_vrfy_ok(warm_smtp_client: SMTP) -> None:
     nice_address = "test@example.com"
-    async with smtp_client:
-        response = await smtp_client.vrfy(nice_address)
+    response = await warm_smtp_client.vrfy(nice_address)
 
-        assert response.code == SMTPStatus.cannot_vrfy
+    assert response.code == SMTPStatus.cannot_vrfy
 
 
-async def test_vrfy_with_blank_address(
-    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
-) -> None:
+async def test_vrfy_with_blank_address(warm_smtp_client: SMTP) -> None:
     bad_address = ""
-    async with smtp_client:
-        with pytest.raises(SMTPResponseException):
-            await smtp_client.vrfy(bad_address)
+    with pytest.raises(SMTPResponseException):
+        await warm_smtp_client.vrfy(bad_address)
 
 
 async def test_vrfy_smtputf8_supported(
@@ -339,11 +355,10 @@ async def test_expn_smtputf8_not_supported(
             await smtp_client.expn(utf8_list, options=["SMTPUTF8"])
 
 
-async def test_help_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        help_message = await smtp_client.help()
+async def test_help_ok(warm_smtp_client: SMTP) -> None:
+    help_message = await warm_smtp_client.help()
 
-        assert "Supported commands" in help_message
+    assert "Supported commands" in help_message
 
 
 async def test_help_error(
@@ -378,24 +393,20 @@ async def test_quit_error(
         assert exception_info.value.code == error_code
 
 
-async def test_supported_methods(
-    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
-) -> None:
-    async with smtp_client:
-        response = await smtp_client.ehlo()
+async def test_supported_methods(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.ehlo()
 
-        assert response.code == SMTPStatus.completed
-        assert smtp_client.supports_extension("size")
-        assert smtp_client.supports_extension("help")
-        assert not smtp_client.supports_extension("bogus")
+    assert response.code == SMTPStatus.completed
+    assert warm_smtp_client.supports_extension("size")
+    assert warm_smtp_client.supports_extension("help")
+    assert not warm_smtp_client.supports_extension("bogus")
 
 
-async def test_mail_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        response = await smtp_client.mail("j@example.com")
+async def test_mail_ok(warm_smtp_client: SMTP) -> None:
+    response = await warm_smtp_client.mail("j@example.com")
 
-        assert response.code == SMTPStatus.completed
-        assert response.message == "OK"
+    assert response.code == SMTPStatus.completed
+    assert response.message == "OK"
 
 
 async def test_mail_error(
@@ -441,14 +452,13 @@ async def test_mail_default_encoding_utf8_encode_error(
             await smtp_client.mail("tést@exåmple.com", options=["SMTPUTF8"])
 
 
-async def test_rcpt_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        await smtp_client.mail("j@example.com")
+async def test_rcpt_ok(warm_smtp_client: SMTP) -> None:
+    await warm_smtp_client.mail("j@example.com")
 
-        response = await smtp_client.rcpt("test@example.com")
+    response = await warm_smtp_client.rcpt("test@example.com")
 
-        assert response.code == SMTPStatus.completed
-        assert response.message == "OK"
+    assert response.code == SMTPStatus.completed
+    assert response.message == "OK"
 
 
 async def test_rcpt_options_ok(
@@ -521,14 +531,13 @@ async def test_rcpt_default_encoding_utf8_encode_error(
             await smtp_client.rcpt("tést@exåmple.com", options=["SMTPUTF8"])
 
 
-async def test_data_ok(smtp_client: SMTP, smtpd_server: asyncio.AbstractServer) -> None:
-    async with smtp_client:
-        await smtp_client.mail("j@example.com")
-        await smtp_client.rcpt("test@example.com")
-        response = await smtp_client.data("HELLO WORLD")
+async def test_data_ok(warm_smtp_client: SMTP) -> None:
+    await warm_smtp_client.mail("j@example.com")
+    await warm_smtp_client.rcpt("test@example.com")
+    response = await warm_smtp_client.data("HELLO WORLD")
 
-        assert response.code == SMTPStatus.completed
-        assert response.message == "OK"
+    assert response.code == SMTPStatus.completed
+    assert response.message == "OK"
 
 
 async def test_data_error_on_start_input(
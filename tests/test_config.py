@@ -53,6 +53,40 @@ async def test_use_tls_and_start_tls_to_connect_raises() -> None:
         await client.connect(start_tls=True)
 
 
+async def test_hostname_newline_set_directly_raises_on_connect(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    client = SMTP(hostname=hostname, port=smtpd_server_port, start_tls=False)
+    client.hostname = "localhost\r\nRCPT TO: <hacker@hackers.org>"
+
+    with pytest.raises(ValueError):
+        await client.connect()
+
+
+async def test_use_tls_and_start_tls_set_directly_raises_on_connect(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    client = SMTP(hostname=hostname, port=smtpd_server_port)
+    client.use_tls = True
+    client._start_tls_on_connect = True
+
+    with pytest.raises(ValueError):
+        await client.connect()
+
+
+async def test_use_tls_and_start_tls_to_connect_after_connect_raises(
+    hostname: str,
+    smtpd_server_port: int,
+) -> None:
+    client = SMTP(hostname=hostname, port=smtpd_server_port, start_tls=False)
+    await client.connect()
+    await client.quit()
+
+    client.use_tls = True
+    with pytest.raises(ValueError):
+        await client.connect(start_tls=True)
+
+
 async def test_socket_and_hostname_raises() -> None:
     with pytest.raises(ValueError):
         SMTP(hostname="example.com", sock=socket.socket(socket.AF_INET))
@@ -68,6 +102,16 @@ async def test_socket_and_socket_path_raises() -> None:
         SMTP(socket_path="/tmp/test", sock=socket.socket(socket.AF_INET))  # nosec
 
 
+async def test_socket_and_port_zero_raises() -> None:
+    with pytest.raises(ValueError):
+        SMTP(hostname=None, port=0, sock=socket.socket(socket.AF_INET))
+
+
+async def test_port_zero_and_socket_path_raises() -> None:
+    with pytest.raises(ValueError):
+        SMTP(hostname=None, port=0, socket_path="/tmp/test")  # nosec
+
+
 async def test_hostname_and_socket_path_raises() -> None:
     with pytest.raises(ValueError):
         SMTP(hostname="example.com", socket_path="/tmp/test")  # nosec
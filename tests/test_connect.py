@@ -4,6 +4,7 @@ Connectivity tests.
 import asyncio
 import pathlib
 import socket
+import sys
 from typing import Any, Callable, List, Tuple, Type, Union
 
 import pytest
@@ -16,6 +17,9 @@ from aiosmtplib import (
     SMTPServerDisconnected,
     SMTPStatus,
 )
+from aiosmtplib.smtp import IP_BIND_ADDRESS_NO_PORT, _addrinfo_cache
+
+from .resolver import MockResolver
 
 
 pytestmark = pytest.mark.asyncio()
@@ -26,7 +30,7 @@ async def close_during_read_response(smtpd: SMTPD, *args: Any, **kwargs: Any) ->
     await smtpd.push(f"{SMTPStatus.start_input} End data with <CR><LF>.<CR><LF>")
 
     await smtpd._reader.readline()
-    smtpd.transport.close()
+    smtpd.transport.abort()
 
 
 async def test_plain_smtp_connect(
@@ -60,46 +64,26 @@ async def test_quit_then_connect_ok(
         assert response.code == SMTPStatus.completed
 
 
-async def test_bad_connect_response_raises_error(
-    smtp_client: SMTP,
-    smtpd_server: asyncio.AbstractServer,
-    smtpd_class: Type[SMTPD],
-    smtpd_mock_response_unavailable: Callable,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr(smtpd_class, "_handle_client", smtpd_mock_response_unavailable)
-
-    with pytest.raises(SMTPConnectError):
-        await smtp_client.connect()
-
-    assert smtp_client.transport is None
-    assert smtp_client.protocol is None
-
-
-async def test_eof_on_connect_raises_connect_error(
-    smtp_client: SMTP,
-    smtpd_server: asyncio.AbstractServer,
-    smtpd_class: Type[SMTPD],
-    smtpd_mock_response_eof: Callable,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr(smtpd_class, "_handle_client", smtpd_mock_response_eof)
-
-    with pytest.raises(SMTPConnectError):
-        await smtp_client.connect()
-
-    assert smtp_client.transport is None
-    assert smtp_client.protocol is None
-
-
-async def test_close_on_connect_raises_connect_error(
+@pytest.mark.parametrize(
+    "smtpd_mock_response",
+    [
+        "smtpd_mock_response_unavailable",
+        "smtpd_mock_response_eof",
+        "smtpd_mock_response_disconnect",
+    ],
+    ids=["bad_response", "eof", "close"],
+)
+async def test_bad_connect_raises_connect_error(
+    request: pytest.FixtureRequest,
     smtp_client: SMTP,
     smtpd_server: asyncio.AbstractServer,
     smtpd_class: Type[SMTPD],
-    smtpd_mock_response_disconnect: Callable,
     monkeypatch: pytest.MonkeyPatch,
+    smtpd_mock_response: str,
 ) -> None:
-    monkeypatch.setattr(smtpd_class, "_handle_client", smtpd_mock_response_disconnect)
+    monkeypatch.setattr(
+        smtpd_class, "_handle_client", request.getfixturevalue(smtpd_mock_response)
+    )
 
     with pytest.raises(SMTPConnectError):
         await smtp_client.connect()
@@ -126,42 +110,32 @@ async def test_421_closes_connection(
 
 
 async def test_connect_error_with_no_server(
-    hostname: str, unused_tcp_port: int
+    hostname: str, closed_tcp_port: int
 ) -> None:
-    client = SMTP(hostname=hostname, port=unused_tcp_port)
+    client = SMTP(hostname=hostname, port=closed_tcp_port)
 
     with pytest.raises(SMTPConnectError):
         # SMTPConnectTimeoutError vs SMTPConnectError here depends on
         # processing time.
-        await client.connect(timeout=1.0)
-
-
-async def test_disconnected_server_raises_on_client_read(
-    smtp_client: SMTP,
-    smtpd_server: asyncio.AbstractServer,
-    smtpd_class: Type[SMTPD],
-    smtpd_mock_response_disconnect: Callable,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr(smtpd_class, "smtp_NOOP", smtpd_mock_response_disconnect)
-
-    await smtp_client.connect()
+        await client.connect(timeout=0.1)
 
-    with pytest.raises(SMTPServerDisconnected):
-        await smtp_client.execute_command(b"NOOP")
 
-    assert smtp_client.protocol is None
-    assert smtp_client.transport is None
-
-
-async def test_disconnected_server_raises_on_client_write(
+@pytest.mark.parametrize(
+    "smtpd_mock_response",
+    ["smtpd_mock_response_disconnect", "smtpd_mock_response_eof"],
+    ids=["client_read", "client_write"],
+)
+async def test_disconnected_server_raises_on_command(
+    request: pytest.FixtureRequest,
     smtp_client: SMTP,
     smtpd_server: asyncio.AbstractServer,
     smtpd_class: Type[SMTPD],
-    smtpd_mock_response_eof: Callable,
     monkeypatch: pytest.MonkeyPatch,
+    smtpd_mock_response: str,
 ) -> None:
-    monkeypatch.setattr(smtpd_class, "smtp_NOOP", smtpd_mock_response_eof)
+    monkeypatch.setattr(
+        smtpd_class, "smtp_NOOP", request.getfixturevalue(smtpd_mock_response)
+    )
 
     await smtp_client.connect()
 
@@ -182,12 +156,11 @@ async def test_disconnected_server_raises_on_data_read(
     monkeypatch.setattr(smtpd_class, "smtp_DATA", smtpd_mock_response_disconnect)
 
     await smtp_client.connect()
-    await smtp_client.ehlo()
-    await smtp_client.mail("sender@example.com")
-    await smtp_client.rcpt("recipient@example.com")
 
     with pytest.raises(SMTPServerDisconnected):
-        await smtp_client.data("A MESSAGE")
+        await smtp_client.sendmail(
+            "sender@example.com", ["recipient@example.com"], "A MESSAGE"
+        )
 
     assert smtp_client.protocol is None
     assert smtp_client.transport is None
@@ -202,11 +175,11 @@ async def test_disconnected_server_raises_on_data_write(
     monkeypatch.setattr(smtpd_class, "smtp_DATA", close_during_read_response)
 
     await smtp_client.connect()
-    await smtp_client.ehlo()
-    await smtp_client.mail("sender@example.com")
-    await smtp_client.rcpt("recipient@example.com")
+
     with pytest.raises(SMTPServerDisconnected):
-        await smtp_client.data("A MESSAGE\nLINE2")
+        await smtp_client.sendmail(
+            "sender@example.com", ["recipient@example.com"], "A MESSAGE\nLINE2"
+        )
 
     assert smtp_client.protocol is None
     assert smtp_client.transport is None
@@ -328,9 +301,9 @@ async def test_context_manager_double_entry(
 
 
 async def test_connect_error_second_attempt(
-    hostname: str, unused_tcp_port: int
+    hostname: str, closed_tcp_port: int
 ) -> None:
-    client = SMTP(hostname=hostname, port=unused_tcp_port, timeout=1.0)
+    client = SMTP(hostname=hostname, port=closed_tcp_port, timeout=0.1)
 
     with pytest.raises(SMTPConnectError):
         await client.connect()
@@ -375,15 +348,23 @@ async def test_connect_with_login(
 
 
 async def test_connect_via_socket(
-    smtp_client: SMTP, hostname: str, smtpd_server_port: int
+    event_loop: asyncio.AbstractEventLoop,
+    smtp_client: SMTP,
+    hostname: str,
+    smtpd_server_port: int,
 ) -> None:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-        sock.connect((hostname, smtpd_server_port))
+        sock.setblocking(False)
+        await event_loop.sock_connect(sock, (hostname, smtpd_server_port))
 
         await smtp_client.connect(hostname=None, port=None, sock=sock)
         response = await smtp_client.ehlo()
 
-    assert response.code == SMTPStatus.completed
+        assert response.code == SMTPStatus.completed
+
+        # Disconnect before the socket is closed, so its file descriptor isn't
+        # left registered with the (shared) event loop.
+        await smtp_client.quit()
 
 
 async def test_connect_via_socket_path(
@@ -436,3 +417,213 @@ async def test_disconnected_server_data(
 
     with pytest.raises(SMTPServerDisconnected):
         await smtp_client.data("123")
+
+
+async def test_reconnect_reuses_protocol(
+    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
+) -> None:
+    await smtp_client.connect()
+    first_protocol = smtp_client.protocol
+    await smtp_client.quit()
+    await asyncio.sleep(0)
+
+    await smtp_client.connect()
+    assert smtp_client.protocol is first_protocol
+
+    response = await smtp_client.noop()
+    assert response.code == SMTPStatus.completed
+
+    await smtp_client.quit()
+
+
+async def test_connect_caches_hostname_lookup(
+    hostname: str, smtpd_server_port: int, mock_resolver: MockResolver
+) -> None:
+    mock_resolver.addresses = ["::1", hostname]
+
+    client = SMTP(hostname="smtp.example.com", port=smtpd_server_port, start_tls=False)
+    for _ in range(2):
+        await client.connect()
+        assert client.get_transport_info("peername")[0] == hostname
+        await client.quit()
+
+    assert mock_resolver.lookups == ["smtp.example.com"]
+
+
+async def test_connect_happy_eyeballs_races_address_families(
+    hostname: str,
+    smtpd_server_port: int,
+    mock_resolver: MockResolver,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    mock_resolver.addresses = ["::1", hostname]
+    attempts = []
+    original_connect_socket = SMTP._connect_socket
+
+    async def stalled_ipv6_connect_socket(
+        client: SMTP, address: str, port: int
+    ) -> socket.socket:
+        attempts.append(address)
+        if address == "::1":
+            await asyncio.sleep(10.0)
+
+        return await original_connect_socket(client, address, port)
+
+    monkeypatch.setattr(SMTP, "_connect_socket", stalled_ipv6_connect_socket)
+
+    client = SMTP(
+        hostname="smtp.example.com",
+        port=smtpd_server_port,
+        start_tls=False,
+        timeout=1.0,
+        happy_eyeballs_delay=0.01,
+    )
+    await client.connect()
+
+    assert attempts == ["::1", hostname]
+    assert client.get_transport_info("peername")[0] == hostname
+
+    await client.quit()
+
+
+async def test_happy_eyeballs_reports_all_connection_errors(
+    event_loop: asyncio.AbstractEventLoop,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def refused_connect_socket(
+        client: SMTP, address: str, port: int
+    ) -> socket.socket:
+        raise ConnectionRefusedError(f"Connection refused by {address}")
+
+    monkeypatch.setattr(SMTP, "_connect_socket", refused_connect_socket)
+
+    client = SMTP()
+    client.loop = event_loop
+    with pytest.raises(OSError) as excinfo:
+        await client._race_socket_connections(["::1", "127.0.0.1"], 25)
+
+    assert str(excinfo.value) == (
+        "Multiple exceptions: Connection refused by ::1, "
+        "Connection refused by 127.0.0.1"
+    )
+
+
+async def test_happy_eyeballs_closes_sockets_on_unexpected_error(
+    event_loop: asyncio.AbstractEventLoop,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    both_started = asyncio.Event()
+    connected_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+    async def mock_connect_socket(
+        client: SMTP, address: str, port: int
+    ) -> socket.socket:
+        if address == "::1":
+            await both_started.wait()
+            return connected_socket
+
+        # Finish in the same wait as the first attempt
+        both_started.set()
+        raise RuntimeError("Something unexpected")
+
+    monkeypatch.setattr(SMTP, "_connect_socket", mock_connect_socket)
+
+    client = SMTP(happy_eyeballs_delay=0.01)
+    client.loop = event_loop
+    with pytest.raises(RuntimeError, match="Something unexpected"):
+        await client._race_socket_connections(["::1", "127.0.0.1"], 25)
+
+    assert connected_socket.fileno() == -1
+
+
+async def test_dns_cache_evicts_oldest_and_expired_entries(
+    event_loop: asyncio.AbstractEventLoop,
+    mock_resolver: MockResolver,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("aiosmtplib.smtp.DNS_CACHE_SIZE", 2)
+
+    client = SMTP()
+    client.loop = event_loop
+    for host in ("a.example.com", "b.example.com", "c.example.com"):
+        await client._resolve_hostname(host, 25)
+
+    assert list(_addrinfo_cache) == [
+        ("b.example.com", 25),
+        ("c.example.com", 25),
+    ]
+
+    client.dns_cache_ttl = 0.01
+    await client._resolve_hostname("a.example.com", 25)
+    await asyncio.sleep(0.02)
+    await client._resolve_hostname("a.example.com", 25)
+
+    assert mock_resolver.lookups == [
+        "a.example.com",
+        "b.example.com",
+        "c.example.com",
+        "a.example.com",
+        "a.example.com",
+    ]
+    assert len(_addrinfo_cache) == 2
+
+
+async def test_connect_dns_cache_disabled(
+    smtpd_server_port: int, mock_resolver: MockResolver
+) -> None:
+    client = SMTP(
+        hostname="smtp.example.com",
+        port=smtpd_server_port,
+        start_tls=False,
+        dns_cache_ttl=None,
+    )
+    for _ in range(2):
+        await client.connect()
+        await client.quit()
+
+    assert mock_resolver.lookups == ["smtp.example.com", "smtp.example.com"]
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="IP_BIND_ADDRESS_NO_PORT is Linux only"
+)
+async def test_connect_source_address_binds_without_port(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    client = SMTP(
+        hostname=hostname,
+        port=smtpd_server_port,
+        source_address=(hostname, 0),
+        start_tls=False,
+    )
+    await client.connect()
+
+    sock = client.get_transport_info("socket")
+    assert sock.getsockopt(socket.IPPROTO_IP, IP_BIND_ADDRESS_NO_PORT) == 1
+    assert client.get_transport_info("sockname")[0] == hostname
+    assert client.get_transport_info("sockname")[1] != 0
+
+    await client.quit()
+
+
+async def test_connect_ipv6_source_address(
+    event_loop: asyncio.AbstractEventLoop, smtpd_factory: Callable[[], SMTPD]
+) -> None:
+    try:
+        server = await event_loop.create_server(
+            smtpd_factory, host="::1", port=0, family=socket.AF_INET6
+        )
+    except OSError:
+        pytest.skip("IPv6 loopback not available")
+
+    port = server.sockets[0].getsockname()[1]
+    client = SMTP(
+        hostname="::1", port=port, source_address=("::1", 0, 0, 0), start_tls=False
+    )
+    try:
+        await client.connect()
+        assert client.get_transport_info("sockname")[0] == "::1"
+        await client.quit()
+    finally:
+        server.close()
+        await server.wait_closed()
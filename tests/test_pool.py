@@ -0,0 +1,277 @@
+"""
+Connection pool tests.
+"""
+import asyncio
+import socket
+from typing import Any, Callable, List, Tuple, Type
+
+import pytest
+from aiosmtpd.smtp import SMTP as SMTPD
+
+from aiosmtplib import SMTPConnectionPool, SMTPStatus
+
+
+pytestmark = pytest.mark.asyncio()
+
+
+async def test_acquire_reuses_connection(
+    hostname: str,
+    smtpd_server_port: int,
+    received_commands: List[Tuple[str, Tuple[Any, ...]]],
+) -> None:
+    async with SMTPConnectionPool() as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            response = await first_client.noop()
+            assert response.code == SMTPStatus.completed
+
+        assert pool.idle_count == 1
+
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as second_client:
+            assert second_client is first_client
+            assert second_client.is_connected
+
+        assert pool.connection_count == 1
+
+    assert pool.connection_count == 0
+    assert not first_client.is_connected
+
+    commands = [command[0] for command in received_commands]
+    assert commands.count("EHLO") == 1
+    assert commands.count("RSET") == 1
+    assert commands[-1] == "QUIT"
+
+
+async def test_acquire_different_options_not_reused(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    async with SMTPConnectionPool() as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            pass
+
+        async with pool.acquire(
+            hostname=hostname,
+            port=smtpd_server_port,
+            start_tls=False,
+            local_hostname="example.com",
+        ) as second_client:
+            assert second_client is not first_client
+
+        assert pool.connection_count == 2
+        assert pool.idle_count == 2
+
+
+async def test_acquire_exception_closes_connection(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    async with SMTPConnectionPool() as pool:
+        with pytest.raises(ZeroDivisionError):
+            async with pool.acquire(
+                hostname=hostname, port=smtpd_server_port, start_tls=False
+            ) as client:
+                1 / 0  # noqa
+
+        assert not client.is_connected
+        assert pool.connection_count == 0
+        assert pool.idle_count == 0
+
+
+async def test_failed_rset_makes_new_connection(
+    hostname: str,
+    smtpd_server_port: int,
+    smtpd_class: Type[SMTPD],
+    smtpd_mock_response_error_disconnect: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(smtpd_class, "smtp_RSET", smtpd_mock_response_error_disconnect)
+
+    async with SMTPConnectionPool() as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            pass
+
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as second_client:
+            assert second_client is not first_client
+            assert second_client.is_connected
+
+        assert pool.connection_count == 1
+
+
+async def test_failed_client_construction_frees_slot(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    async with SMTPConnectionPool(max_connections=1) as pool:
+        with pytest.raises(ValueError):
+            async with pool.acquire(
+                hostname=hostname, port=smtpd_server_port, socket_path="/tmp/test"
+            ):
+                pass
+
+        assert pool.connection_count == 0
+
+        async def acquire_client() -> None:
+            async with pool.acquire(
+                hostname=hostname, port=smtpd_server_port, start_tls=False
+            ) as client:
+                assert client.is_connected
+
+        await asyncio.wait_for(acquire_client(), timeout=1.0)
+
+
+async def test_cancelled_rset_frees_slot(
+    hostname: str,
+    smtpd_server_port: int,
+    smtpd_class: Type[SMTPD],
+    smtpd_mock_response_delayed_ok: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def acquire_client() -> None:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ):
+            pass
+
+    # Server connections bind their command handlers on creation
+    monkeypatch.setattr(smtpd_class, "smtp_RSET", smtpd_mock_response_delayed_ok)
+
+    async with SMTPConnectionPool(max_connections=1) as pool:
+        await acquire_client()
+        assert pool.idle_count == 1
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(acquire_client(), timeout=0.1)
+
+        assert pool.connection_count == 0
+        assert pool.idle_count == 0
+
+        await asyncio.wait_for(acquire_client(), timeout=1.0)
+
+
+async def test_close_wakes_waiting_acquire(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    pool = SMTPConnectionPool(max_connections=1)
+
+    async def acquire_client() -> None:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ):
+            pass
+
+    async with pool.acquire(hostname=hostname, port=smtpd_server_port, start_tls=False):
+        waiter = asyncio.create_task(acquire_client())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        await pool.close()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, timeout=1.0)
+
+    assert pool.connection_count == 0
+
+
+async def test_max_keepalive(hostname: str, smtpd_server_port: int) -> None:
+    async with SMTPConnectionPool(max_keepalive=1) as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            async with pool.acquire(
+                hostname=hostname, port=smtpd_server_port, start_tls=False
+            ) as second_client:
+                assert pool.connection_count == 2
+
+        assert pool.idle_count == 1
+        assert pool.connection_count == 1
+        assert not first_client.is_connected
+        assert second_client.is_connected
+
+
+async def test_keepalive_expiry(hostname: str, smtpd_server_port: int) -> None:
+    async with SMTPConnectionPool(keepalive_expiry=0.0) as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            pass
+
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as second_client:
+            assert second_client is not first_client
+            assert not first_client.is_connected
+
+        assert pool.connection_count == 1
+
+
+async def test_max_connections_waits_for_release(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    pool = SMTPConnectionPool(max_connections=1)
+
+    async def send_noop() -> None:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as client:
+            assert pool.connection_count == 1
+            await client.noop()
+
+    await asyncio.gather(send_noop(), send_noop(), send_noop())
+
+    assert pool.connection_count == 1
+    await pool.close()
+    assert pool.connection_count == 0
+
+
+async def test_max_connections_closes_idle_for_other_options(
+    hostname: str, smtpd_server_port: int
+) -> None:
+    async with SMTPConnectionPool(max_connections=1) as pool:
+        async with pool.acquire(
+            hostname=hostname, port=smtpd_server_port, start_tls=False
+        ) as first_client:
+            pass
+
+        async with pool.acquire(
+            hostname=hostname,
+            port=smtpd_server_port,
+            start_tls=False,
+            local_hostname="example.com",
+        ):
+            assert not first_client.is_connected
+            assert pool.connection_count == 1
+
+
+async def test_acquire_after_close_raises(hostname: str) -> None:
+    pool = SMTPConnectionPool()
+    await pool.close()
+
+    with pytest.raises(RuntimeError):
+        async with pool.acquire(hostname=hostname):
+            pass
+
+
+async def test_acquire_with_sock_raises() -> None:
+    pool = SMTPConnectionPool()
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        with pytest.raises(ValueError):
+            async with pool.acquire(hostname=None, port=None, sock=sock):
+                pass
+
+
+@pytest.mark.parametrize(
+    "max_connections,max_keepalive",
+    [(0, 1), (1, -1)],
+    ids=["max_connections", "max_keepalive"],
+)
+async def test_invalid_limits_raise(max_connections: int, max_keepalive: int) -> None:
+    with pytest.raises(ValueError):
+        SMTPConnectionPool(max_connections=max_connections, max_keepalive=max_keepalive)
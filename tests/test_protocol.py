@@ -28,6 +28,45 @@ async def test_protocol_connect(
     transport.close()
 
 
+async def test_protocol_is_own_factory(
+    event_loop: asyncio.AbstractEventLoop, hostname: str, echo_server_port: int
+) -> None:
+    protocol = SMTPProtocol(loop=event_loop)
+    transport, connected_protocol = await event_loop.create_connection(
+        protocol, host=hostname, port=echo_server_port
+    )
+
+    assert connected_protocol is protocol
+    assert protocol.transport is transport
+
+    transport.close()
+
+
+async def test_protocol_reset_after_connection_lost(
+    event_loop: asyncio.AbstractEventLoop, hostname: str, echo_server_port: int
+) -> None:
+    protocol = SMTPProtocol(loop=event_loop)
+    transport, _ = await event_loop.create_connection(
+        lambda: protocol, host=hostname, port=echo_server_port
+    )
+
+    with pytest.raises(RuntimeError):
+        protocol.reset()
+
+    transport.close()
+    await asyncio.sleep(0)
+    assert protocol.transport is None
+
+    protocol.reset()
+
+    transport, _ = await event_loop.create_connection(
+        lambda: protocol, host=hostname, port=echo_server_port
+    )
+    assert protocol.is_connected
+
+    transport.close()
+
+
 async def test_protocol_read_limit_overrun(
     event_loop: asyncio.AbstractEventLoop,
     bind_address: str,
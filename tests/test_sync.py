@@ -1,7 +1,14 @@
 """
 Sync method tests.
 """
+import asyncio
 import email.message
+import socket
+import ssl
+from typing import Callable
+
+import pytest
+from aiosmtpd.smtp import SMTP as SMTPD
 
 from aiosmtplib import SMTP
 
@@ -30,3 +37,55 @@ def test_send_message_sync(
     assert not errors
     assert isinstance(errors, dict)
     assert response != ""
+
+
+@pytest.mark.parametrize("use_tls", [False, True], ids=["plain", "tls"])
+def test_close_works_on_stopped_loop(
+    bind_address: str,
+    hostname: str,
+    smtpd_factory: Callable[[], SMTPD],
+    server_tls_context: ssl.SSLContext,
+    client_tls_context: ssl.SSLContext,
+    use_tls: bool,
+) -> None:
+    # The session event loop is shared, so stop one of our own instead.
+    event_loop = asyncio.new_event_loop()
+    server = event_loop.run_until_complete(
+        event_loop.create_server(
+            smtpd_factory,
+            host=bind_address,
+            port=0,
+            family=socket.AF_INET,
+            ssl=server_tls_context if use_tls else None,
+        )
+    )
+    client = SMTP(
+        hostname=hostname,
+        port=server.sockets[0].getsockname()[1],
+        use_tls=use_tls,
+        start_tls=False,
+        tls_context=client_tls_context,
+    )
+    event_loop.run_until_complete(client.connect())
+    assert client.is_connected
+    assert client.transport is not None
+    assert (client.get_transport_info("sslcontext") is not None) is use_tls
+
+    def stop_and_close() -> None:
+        event_loop.stop()
+        client.close()
+
+    # Stop the loop while it's running, then close the connection
+    event_loop.call_soon(stop_and_close)
+    event_loop.run_forever()
+
+    assert not client.is_connected
+
+    server.close()
+    event_loop.run_until_complete(server.wait_closed())
+    pending = asyncio.all_tasks(event_loop)
+    if pending:
+        for task in pending:
+            task.cancel()
+        event_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    event_loop.close()
@@ -4,7 +4,7 @@ Timeout tests.
 import asyncio
 import socket
 import ssl
-from typing import Callable, Type
+from typing import Any, Callable, Optional, Type
 
 import pytest
 from aiosmtpd.smtp import SMTP as SMTPD
@@ -16,6 +16,7 @@ from aiosmtplib import (
     SMTPTimeoutError,
 )
 from aiosmtplib.protocol import SMTPProtocol
+from aiosmtplib.response import SMTPResponse
 
 
 pytestmark = pytest.mark.asyncio()
@@ -83,6 +84,36 @@ async def test_timeout_on_initial_read(
         await smtp_client.connect(timeout=0.01)
 
 
+async def test_connect_and_initial_read_share_timeout(
+    smtp_client: SMTP,
+    smtpd_server: asyncio.AbstractServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    read_timeouts = []
+    original_read_response = SMTPProtocol.read_response
+
+    async def record_read_response(
+        protocol: SMTPProtocol, timeout: Optional[float] = None
+    ) -> SMTPResponse:
+        read_timeouts.append(timeout)
+        return await original_read_response(protocol, timeout=timeout)
+
+    original_create_tcp_connection = SMTP._create_tcp_connection
+
+    async def slow_create_tcp_connection(*args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(0.1)
+        return await original_create_tcp_connection(*args, **kwargs)
+
+    monkeypatch.setattr(SMTPProtocol, "read_response", record_read_response)
+    monkeypatch.setattr(SMTP, "_create_tcp_connection", slow_create_tcp_connection)
+
+    await smtp_client.connect(timeout=1.0)
+
+    assert len(read_timeouts) >= 1
+    assert read_timeouts[0] is not None
+    assert read_timeouts[0] <= 0.9
+
+
 async def test_timeout_on_starttls(
     smtp_client: SMTP,
     smtpd_server: asyncio.AbstractServer,
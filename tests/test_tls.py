@@ -3,6 +3,7 @@ TLS and STARTTLS handling.
 """
 import asyncio
 import copy
+import shutil
 import ssl
 from typing import Callable, Type
 
@@ -17,6 +18,7 @@ from aiosmtplib import (
     SMTPServerDisconnected,
     SMTPStatus,
 )
+from aiosmtplib.smtp import clear_ssl_context_cache
 
 
 pytestmark = pytest.mark.asyncio()
@@ -323,6 +325,18 @@ async def test_starttls_cert_no_validate(
     assert response.code == SMTPStatus.ready
 
 
+async def test_starttls_refreshes_transport_info(
+    smtp_client: SMTP, smtpd_server: asyncio.AbstractServer
+) -> None:
+    async with smtp_client:
+        assert smtp_client.get_transport_info("sslcontext") is None
+
+        await smtp_client.starttls()
+
+        assert smtp_client.get_transport_info("sslcontext") is not None
+        assert smtp_client.get_transport_info("cipher") is not None
+
+
 async def test_tls_get_transport_info(
     smtp_client_tls: SMTP,
     hostname: str,
@@ -410,3 +424,69 @@ async def test_tls_connection_with_cert_error(
         await smtp_client_tls.connect()
 
     assert "CERTIFICATE" in str(exception_info.value).upper()
+
+
+async def test_tls_context_cached_for_same_options(
+    hostname: str,
+    ca_cert_path: str,
+    valid_cert_path: str,
+    valid_key_path: str,
+) -> None:
+    clear_ssl_context_cache()
+
+    def build_client() -> SMTP:
+        return SMTP(
+            hostname=hostname,
+            use_tls=True,
+            client_cert=valid_cert_path,
+            client_key=valid_key_path,
+            cert_bundle=ca_cert_path,
+        )
+
+    first_context = build_client()._get_tls_context()
+    second_context = build_client()._get_tls_context()
+
+    assert first_context is second_context
+
+    clear_ssl_context_cache()
+
+    assert build_client()._get_tls_context() is not first_context
+
+
+async def test_tls_context_cache_checks_file_contents(
+    hostname: str,
+    ca_cert_path: str,
+    invalid_cert_path: str,
+) -> None:
+    client = SMTP(hostname=hostname, use_tls=True, cert_bundle=ca_cert_path)
+    first_context = client._get_tls_context()
+
+    shutil.copyfile(invalid_cert_path, ca_cert_path)
+
+    assert client._get_tls_context() is not first_context
+
+
+async def test_tls_context_not_cached_for_validate_certs_change(
+    hostname: str,
+) -> None:
+    validating_context = SMTP(hostname=hostname, validate_certs=True)._get_tls_context()
+    context = SMTP(hostname=hostname, validate_certs=False)._get_tls_context()
+
+    assert context is not validating_context
+    assert context.verify_mode == ssl.CERT_NONE
+
+
+async def test_default_tls_context_shared(hostname: str) -> None:
+    clear_ssl_context_cache()
+
+    first_context = SMTP(hostname=hostname, use_tls=True)._get_tls_context()
+    second_context = SMTP(hostname=hostname, use_tls=True)._get_tls_context()
+
+    assert first_context is second_context
+    assert first_context.verify_mode == ssl.CERT_REQUIRED
+    assert first_context.check_hostname
+
+    clear_ssl_context_cache()
+
+    new_context = SMTP(hostname=hostname, use_tls=True)._get_tls_context()
+    assert new_context is not first_context